@@ -0,0 +1,28 @@
+-- Cascade check for bulk_delete.py
+
+-- Delete rule of every foreign key that references recipes
+-- Called via POST /rest/v1/rpc/recipe_delete_rules; bulk_delete.py only deletes
+-- from recipes alone when every rule is CASCADE (see fix_foreign_keys.sql)
+CREATE OR REPLACE FUNCTION recipe_delete_rules()
+RETURNS TABLE(table_name TEXT, column_name TEXT, delete_rule TEXT)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        c.conrelid::regclass::TEXT,
+        a.attname::TEXT,
+        CASE c.confdeltype
+            WHEN 'c' THEN 'CASCADE'
+            WHEN 'n' THEN 'SET NULL'
+            WHEN 'd' THEN 'SET DEFAULT'
+            WHEN 'r' THEN 'RESTRICT'
+            ELSE 'NO ACTION'
+        END
+    FROM pg_constraint AS c
+    JOIN pg_attribute AS a
+      ON a.attrelid = c.conrelid
+     AND a.attnum = c.conkey[1]
+    WHERE c.contype = 'f'
+      AND c.confrelid = 'public.recipes'::regclass
+    ORDER BY 1, 2;
+$$;
@@ -0,0 +1,65 @@
+-- Server-side change stamps for catalog_mirror.py
+-- Writers no longer send updated_at: the database sets it, so the mirror's watermark only
+-- ever compares timestamps from one clock
+
+ALTER TABLE recipes ALTER COLUMN updated_at SET DEFAULT NOW();
+
+-- Re-pulling a changed recipe's children filters on these foreign keys
+CREATE INDEX IF NOT EXISTS idx_recipe_ingredients_recipe_id ON recipe_ingredients(recipe_id);
+CREATE INDEX IF NOT EXISTS idx_preparation_steps_recipe_id ON preparation_steps(recipe_id);
+
+-- Every insert or update of a recipe gets the server's time, whatever the client sent
+CREATE OR REPLACE FUNCTION set_recipe_updated_at()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    NEW.updated_at := NOW();
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS recipes_set_updated_at ON recipes;
+CREATE TRIGGER recipes_set_updated_at
+    BEFORE INSERT OR UPDATE ON recipes
+    FOR EACH ROW EXECUTE FUNCTION set_recipe_updated_at();
+
+-- Child rows have no updated_at of their own: any write to a recipe's ingredients or steps
+-- bumps the recipe instead, once per statement, so the mirror re-pulls that recipe's children
+CREATE OR REPLACE FUNCTION touch_parent_recipes()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    UPDATE recipes SET updated_at = NOW()
+    WHERE id IN (SELECT DISTINCT recipe_id FROM changed_rows);
+    RETURN NULL;
+END;
+$$;
+
+-- Transition tables allow one event per trigger, hence three per table
+DROP TRIGGER IF EXISTS recipe_ingredients_touch_insert ON recipe_ingredients;
+CREATE TRIGGER recipe_ingredients_touch_insert
+    AFTER INSERT ON recipe_ingredients REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION touch_parent_recipes();
+DROP TRIGGER IF EXISTS recipe_ingredients_touch_update ON recipe_ingredients;
+CREATE TRIGGER recipe_ingredients_touch_update
+    AFTER UPDATE ON recipe_ingredients REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION touch_parent_recipes();
+DROP TRIGGER IF EXISTS recipe_ingredients_touch_delete ON recipe_ingredients;
+CREATE TRIGGER recipe_ingredients_touch_delete
+    AFTER DELETE ON recipe_ingredients REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION touch_parent_recipes();
+
+DROP TRIGGER IF EXISTS preparation_steps_touch_insert ON preparation_steps;
+CREATE TRIGGER preparation_steps_touch_insert
+    AFTER INSERT ON preparation_steps REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION touch_parent_recipes();
+DROP TRIGGER IF EXISTS preparation_steps_touch_update ON preparation_steps;
+CREATE TRIGGER preparation_steps_touch_update
+    AFTER UPDATE ON preparation_steps REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION touch_parent_recipes();
+DROP TRIGGER IF EXISTS preparation_steps_touch_delete ON preparation_steps;
+CREATE TRIGGER preparation_steps_touch_delete
+    AFTER DELETE ON preparation_steps REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION touch_parent_recipes();
@@ -0,0 +1,27 @@
+-- Add precomputed image placeholders to recipes
+-- image_blurhash: BlurHash string the app can decode into a blurred preview
+-- image_lqip: tiny base64 JPEG data URI shown while the full image loads
+-- image_hash: SHA-256 of the source image the placeholders were built from
+
+ALTER TABLE recipes ADD COLUMN IF NOT EXISTS image_blurhash TEXT;
+ALTER TABLE recipes ADD COLUMN IF NOT EXISTS image_lqip TEXT;
+ALTER TABLE recipes ADD COLUMN IF NOT EXISTS image_hash TEXT;
+
+-- Apply every placeholder change in one statement
+-- Called from generate_image_placeholders.py via POST /rest/v1/rpc/update_recipe_placeholders
+CREATE OR REPLACE FUNCTION update_recipe_placeholders(updates JSONB)
+RETURNS INTEGER
+LANGUAGE sql
+AS $$
+    WITH changed AS (
+        UPDATE recipes AS r
+        SET image_blurhash = u.image_blurhash,
+            image_lqip = u.image_lqip,
+            image_hash = u.image_hash,
+            updated_at = NOW()
+        FROM jsonb_to_recordset(updates) AS u(id UUID, image_blurhash TEXT, image_lqip TEXT, image_hash TEXT)
+        WHERE r.id = u.id
+        RETURNING 1
+    )
+    SELECT COUNT(*)::INTEGER FROM changed;
+$$;
@@ -0,0 +1,19 @@
+-- Bulk image URL updates for sync_recipe_images.py
+
+-- Repoint any number of recipes in one statement
+-- Called via POST /rest/v1/rpc/update_recipe_image_urls with {"updates": [{"id": ..., "image_url": ...}]}
+CREATE OR REPLACE FUNCTION update_recipe_image_urls(updates JSONB)
+RETURNS INTEGER
+LANGUAGE sql
+AS $$
+    WITH changed AS (
+        UPDATE recipes AS r
+        SET image_url = u.image_url,
+            updated_at = NOW()
+        FROM jsonb_to_recordset(updates) AS u(id UUID, image_url TEXT)
+        WHERE r.id = u.id
+          AND r.image_url IS DISTINCT FROM u.image_url
+        RETURNING 1
+    )
+    SELECT COUNT(*)::INTEGER FROM changed;
+$$;
@@ -0,0 +1,20 @@
+-- Orphaned ingredient lookup for ingredient_gc.py
+
+-- The anti-join below probes recipe_ingredients by ingredient_id; the
+-- UNIQUE(recipe_id, ingredient_id) index leads with recipe_id and cannot serve it
+CREATE INDEX IF NOT EXISTS idx_recipe_ingredients_ingredient_id ON recipe_ingredients(ingredient_id);
+
+-- Ingredients no recipe_ingredients row references
+-- Called via POST /rest/v1/rpc/orphan_ingredients
+CREATE OR REPLACE FUNCTION orphan_ingredients()
+RETURNS TABLE(id UUID, name TEXT, created_at TIMESTAMP WITH TIME ZONE)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT i.id, i.name, i.created_at
+    FROM ingredients AS i
+    WHERE NOT EXISTS (
+        SELECT 1 FROM recipe_ingredients AS ri WHERE ri.ingredient_id = i.id
+    )
+    ORDER BY i.name;
+$$;
@@ -0,0 +1,17 @@
+-- Soft deletes for soft_delete.py, delete_specific_recipes.py and delete_unwanted_recipes.py
+
+-- NULL while live; set to the deletion time when a recipe is tombstoned
+ALTER TABLE recipes ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMP WITH TIME ZONE;
+
+-- Names are unique among live recipes only, so a tombstone never blocks re-uploading its name.
+-- recipes_name_key is the constraint a "name TEXT UNIQUE" column gets; the unique index below
+-- fails to build while live duplicates remain (run cleanup_duplicates.py first)
+ALTER TABLE recipes DROP CONSTRAINT IF EXISTS recipes_name_key;
+DROP INDEX IF EXISTS idx_recipes_live_name;
+CREATE UNIQUE INDEX IF NOT EXISTS recipes_live_name_key ON recipes(name) WHERE deleted_at IS NULL;
+-- The purge scans tombstones oldest first
+CREATE INDEX IF NOT EXISTS idx_recipes_deleted_at ON recipes(deleted_at) WHERE deleted_at IS NOT NULL;
+
+-- What the app reads instead of recipes; security_invoker keeps the recipes RLS policies in force
+CREATE OR REPLACE VIEW live_recipes WITH (security_invoker = true) AS
+SELECT * FROM recipes WHERE deleted_at IS NULL;
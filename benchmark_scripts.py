@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Script Benchmarks Against the Local Supabase Stand-in
+Runs the ingest, image and cleanup scripts at several catalog sizes and
+records round trips, wall time and peak memory so regressions show up
+"""
+
+import json
+import multiprocessing
+import os
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+import requests
+
+from cleanup_duplicates import DuplicateCleaner
+from create_and_upload_images import SupabaseImageUploader
+from image_manifest import ImageManifest
+from recipe_upload_json import SimpleRecipeUploader
+from supabase_client import SupabaseClient
+from supabase_standin_server import SupabaseStandinServer
+from sync_recipe_images import ImageSync
+from upload_complete_recipes import CompleteRecipeUploader
+
+RESULTS_FILE = 'benchmark_results.json'
+BENCHMARK_KEY = 'benchmark-key'
+
+# Flag a run whose wall time, round trips or peak memory grew by more than this
+REGRESSION_THRESHOLD = 0.2
+
+# ru_maxrss is in KiB on Linux and bytes on macOS
+RSS_UNIT = 1 if sys.platform == 'darwin' else 1024
+
+INGREDIENT_POOL_SIZE = 200
+DUPLICATE_FRACTION = 0.1
+
+
+# Synthetic catalog
+
+def make_recipes(size: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Recipes in the shape recipe_upload_json and upload_complete_recipes take"""
+    rng = random.Random(seed)
+    recipes = []
+    for i in range(size):
+        ingredients = rng.sample(range(INGREDIENT_POOL_SIZE), rng.randint(4, 8))
+        recipes.append({
+            'name': f'Benchmark Recipe {i:05d}',
+            'prep_time': rng.randint(5, 60),
+            'description': f'Synthetic recipe number {i} for benchmarking',
+            'protein': rng.randint(5, 40),
+            'carbs': rng.randint(5, 60),
+            'fat': rng.randint(2, 30),
+            'calories': rng.randint(150, 700),
+            'ingredients': [
+                {
+                    'name': f'Ingredient {n:03d}',
+                    'amount': f'{rng.randint(1, 4)} cups',
+                    'quantity_value': rng.randint(1, 4),
+                    'quantity_unit': 'cups',
+                    'is_optional': False,
+                    'show_in_list': True
+                }
+                for n in ingredients
+            ],
+            'instructions': [f'Step {step} of recipe {i}' for step in range(1, rng.randint(3, 6) + 1)]
+        })
+    return recipes
+
+
+def ingredient_rows() -> List[Dict[str, Any]]:
+    return [{'id': f'ingredient-{n:03d}', 'name': f'Ingredient {n:03d}'} for n in range(INGREDIENT_POOL_SIZE)]
+
+
+def recipe_rows(recipes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [{'id': f'recipe-{i:05d}', 'name': recipe['name'], 'image_url': None} for i, recipe in enumerate(recipes)]
+
+
+def catalog_rows(recipes: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """A fully populated catalog where every DUPLICATE_FRACTION-th recipe has a second copy"""
+    tables = {'recipes': [], 'ingredients': ingredient_rows(), 'recipe_ingredients': [], 'preparation_steps': []}
+    copies = [(i, recipe, '') for i, recipe in enumerate(recipes)]
+    copies += [(i, recipe, '-copy') for i, recipe in enumerate(recipes) if i % int(1 / DUPLICATE_FRACTION) == 0]
+    for i, recipe, suffix in copies:
+        recipe_id = f'recipe-{i:05d}{suffix}'
+        tables['recipes'].append({'id': recipe_id, 'name': recipe['name']})
+        for ingredient in recipe['ingredients']:
+            tables['recipe_ingredients'].append({
+                'recipe_id': recipe_id,
+                'ingredient_id': f"ingredient-{ingredient['name'].split()[-1]}",
+                'amount': ingredient['amount']
+            })
+        for step, instruction in enumerate(recipe['instructions'], 1):
+            tables['preparation_steps'].append({'recipe_id': recipe_id, 'step_number': step, 'instruction': instruction})
+    return tables
+
+
+# Scenarios: (seed tables, run against the stand-in URL)
+#
+# Ingredients are seeded in the ingest scenarios: recipe_upload_json's
+# ensure_ingredient_exists reads the created row back from a return=minimal
+# insert, so against an empty ingredients table it benchmarks the failure path
+# instead of the ingest. Both scenarios seed the same way so they stay comparable.
+
+def _seed_for_update(recipes):
+    return {'recipes': recipe_rows(recipes), 'ingredients': ingredient_rows()}
+
+
+def _run_upload_complete_recipes(url, recipes, workdir):
+    CompleteRecipeUploader(url, BENCHMARK_KEY).upload_all_recipes(recipes)
+
+
+def _seed_ingredients(recipes):
+    return {'ingredients': ingredient_rows()}
+
+
+def _run_recipe_upload_json(url, recipes, workdir):
+    SimpleRecipeUploader(url, BENCHMARK_KEY).upload_recipe_batch([dict(recipe) for recipe in recipes])
+
+
+def _seed_recipes(recipes):
+    return {'recipes': recipe_rows(recipes)}
+
+
+def _run_create_and_upload_images(url, recipes, workdir):
+    recipes_file = os.path.join(workdir, 'recipes.json')
+    with open(recipes_file, 'w') as f:
+        json.dump(recipe_rows(recipes), f)
+    SupabaseImageUploader(url, BENCHMARK_KEY).upload_all_recipe_images(recipes_file)
+
+
+def _run_sync_recipe_images(url, recipes, workdir):
+    image_dir = os.path.join(workdir, 'images')
+    os.makedirs(image_dir)
+    entries = []
+    for row in recipe_rows(recipes):
+        key = f"{row['id']}.png"
+        with open(os.path.join(image_dir, key), 'wb') as f:
+            f.write(os.urandom(2048))
+        entries.append({'recipe_id': row['id'], 'recipe_name': row['name'], 'key': key})
+    sync = ImageSync(SupabaseClient(url, BENCHMARK_KEY), image_dir, manifest=ImageManifest(entries))
+    sync.apply(sync.plan())
+
+
+def _run_cleanup_duplicates(url, recipes, workdir):
+    DuplicateCleaner(url, BENCHMARK_KEY).cleanup_duplicates(dry_run=False)
+
+
+SCENARIOS: Dict[str, Tuple[Callable, Callable]] = {
+    'upload_complete_recipes': (_seed_for_update, _run_upload_complete_recipes),
+    'recipe_upload_json': (_seed_ingredients, _run_recipe_upload_json),
+    'create_and_upload_images': (_seed_recipes, _run_create_and_upload_images),
+    'sync_recipe_images': (_seed_recipes, _run_sync_recipe_images),
+    'cleanup_duplicates': (catalog_rows, _run_cleanup_duplicates)
+}
+
+
+# Runner
+
+def _serve(connection, tables: Dict[str, List[Dict[str, Any]]], latency: float, error_rate: float):
+    server = SupabaseStandinServer(latency=latency, error_rate=error_rate, tables=tables)
+    connection.send(server.url)
+    server.serve_forever()
+
+
+def _run_scenario(connection, scenario: str, size: int, url: str):
+    """Run a scenario in a process of its own so its peak RSS is measurable"""
+    _, run = SCENARIOS[scenario]
+    recipes = make_recipes(size)
+    workdir = tempfile.mkdtemp(prefix='benchmark-')
+    try:
+        baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        started = time.perf_counter()
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            run(url, recipes, workdir)
+        wall_seconds = time.perf_counter() - started
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    connection.send({'wall_seconds': wall_seconds, 'peak_memory_bytes': (peak - baseline) * RSS_UNIT})
+
+
+def run_benchmark(scenario: str, size: int, latency: float = 0.0, error_rate: float = 0.0) -> Dict[str, Any]:
+    """Run one scenario against a fresh stand-in
+
+    Server and script each get their own process: the script's peak RSS
+    growth is then its own, and the server's work never shares its GIL.
+    """
+    seed_tables, _ = SCENARIOS[scenario]
+
+    server_end, child_end = multiprocessing.Pipe()
+    server = multiprocessing.Process(target=_serve, args=(child_end, seed_tables(make_recipes(size)), latency, error_rate),
+                                     daemon=True)
+    server.start()
+    # Drop our copy of each child's end so recv() raises EOFError if the child dies instead of hanging
+    child_end.close()
+    try:
+        url = server_end.recv()
+        script_end, child_end = multiprocessing.Pipe()
+        script = multiprocessing.Process(target=_run_scenario, args=(child_end, scenario, size, url))
+        script.start()
+        child_end.close()
+        measured = script_end.recv()
+        script.join()
+        stats = requests.get(f'{url}/__standin/stats', timeout=30).json()
+    finally:
+        server.terminate()
+        server.join()
+
+    return {
+        'scenario': scenario,
+        'size': size,
+        'latency': latency,
+        'error_rate': error_rate,
+        'recorded_at': datetime.now().isoformat(),
+        'wall_seconds': round(measured['wall_seconds'], 3),
+        'round_trips': stats['total_requests'],
+        'round_trips_per_recipe': round(stats['total_requests'] / size, 2) if size else None,
+        'peak_memory_bytes': measured['peak_memory_bytes'],
+        'injected_errors': stats['injected_errors'],
+        'requests': stats['requests']
+    }
+
+
+def load_results(path: str = RESULTS_FILE) -> List[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def previous_result(history: List[Dict[str, Any]], result: Dict[str, Any]) -> Dict[str, Any]:
+    """Most recent earlier run of the same scenario under the same conditions"""
+    for earlier in reversed(history):
+        if all(earlier[key] == result[key] for key in ['scenario', 'size', 'latency', 'error_rate']):
+            return earlier
+    return {}
+
+
+def regressions(result: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    found = []
+    for metric in ['wall_seconds', 'round_trips', 'peak_memory_bytes']:
+        if baseline.get(metric) and result[metric] > baseline[metric] * (1 + REGRESSION_THRESHOLD):
+            found.append(f"{metric} {baseline[metric]} → {result[metric]}")
+    return found
+
+
+def main():
+    SCENARIO_NAMES = list(SCENARIOS)
+    # The 10k tier takes several minutes per scenario
+    SIZES = [10, 1000, 10000]
+    LATENCY = 0.0
+    ERROR_RATE = 0.0
+
+    print("🏁 Script Benchmarks (local Supabase stand-in)")
+    print("=" * 50)
+
+    history = load_results()
+    flagged = 0
+    for scenario in SCENARIO_NAMES:
+        for size in SIZES:
+            result = run_benchmark(scenario, size, LATENCY, ERROR_RATE)
+            found = regressions(result, previous_result(history, result))
+            history.append(result)
+            with open(RESULTS_FILE, 'w') as f:
+                json.dump(history, f, indent=2)
+
+            print(f"{'⚠️ ' if found else '✅'} {scenario} @ {size}: {result['wall_seconds']:.2f}s, "
+                  f"{result['round_trips']} round trips ({result['round_trips_per_recipe']}/recipe), "
+                  f"peak RSS +{result['peak_memory_bytes'] / 1024 / 1024:.1f} MiB")
+            for regression in found:
+                flagged += 1
+                print(f"   📈 Regression: {regression}")
+
+    print("\n" + "=" * 50)
+    print(f"📝 Results appended to {RESULTS_FILE}")
+    if flagged:
+        print(f"⚠️  {flagged} regressions over {REGRESSION_THRESHOLD:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Bulk Recipe Deletion
+Resolves every target locally, then deletes recipes in chunked id=in.(...)
+requests and lets ON DELETE CASCADE remove their ingredients and steps
+"""
+
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
+from supabase_client import SupabaseClient
+from supabase_pagination import iter_rows
+
+# Keep IN (...) lists well under URL length limits
+ID_BATCH_SIZE = 100
+
+# Tables whose rows reference recipes; deleted explicitly only when they do not cascade
+CHILD_TABLES = ['recipe_ingredients', 'preparation_steps']
+
+
+class BulkRecipeDeleter:
+    def __init__(self, client: SupabaseClient):
+        self.client = client
+        self._cascades: Optional[bool] = None
+
+    def cascades(self) -> bool:
+        """Whether every foreign key into recipes is ON DELETE CASCADE
+
+        Asks the recipe_delete_rules RPC from add_bulk_delete_functions.sql once.
+        If it is missing or any rule is not CASCADE, child rows are deleted
+        explicitly (still in bulk) before their recipes.
+        """
+        if self._cascades is None:
+            response = self.client.post('/rest/v1/rpc/recipe_delete_rules', json={})
+            if response.status_code != 200:
+                print("⚠️  recipe_delete_rules() not found - apply add_bulk_delete_functions.sql; "
+                      "deleting child rows explicitly")
+                self._cascades = False
+            else:
+                rules = {(rule['table_name'], rule['column_name']): rule['delete_rule'] for rule in response.json()}
+                missing = [table for table in CHILD_TABLES if rules.get((table, 'recipe_id')) != 'CASCADE']
+                if missing:
+                    print(f"⚠️  No ON DELETE CASCADE from {', '.join(missing)} to recipes - apply fix_foreign_keys.sql; "
+                          f"deleting child rows explicitly")
+                self._cascades = not missing
+        return self._cascades
+
+    def resolve_names(self, names: Iterable[str],
+                      recipes: Optional[List[Dict[str, Any]]] = None) -> Dict[str, List[str]]:
+        """Recipe ids per name from one keyset read of id,name (or the recipes passed in)"""
+        wanted = set(names)
+        ids = defaultdict(list)
+        for recipe in recipes if recipes is not None else iter_rows(self.client, 'recipes', 'id,name'):
+            if recipe['name'] in wanted:
+                ids[recipe['name']].append(recipe['id'])
+        return {name: ids.get(name, []) for name in wanted}
+
+    def delete_ids(self, recipe_ids: List[str], filters: str = '') -> List[str]:
+        """Delete recipes by id; returns the ids actually deleted
+
+        Each batch is one request when the foreign keys cascade, three otherwise.
+        filters further restricts which recipes go (say, deleted_at=lt.<time>).
+        It needs cascades(): the explicit child deletes would otherwise strip
+        recipes the filter then keeps, so it raises ValueError without them.
+        """
+        if filters and recipe_ids and not self.cascades():
+            raise ValueError("filters needs ON DELETE CASCADE on recipes (fix_foreign_keys.sql)")
+        deleted = []
+        for start in range(0, len(recipe_ids), ID_BATCH_SIZE):
+            batch = recipe_ids[start:start + ID_BATCH_SIZE]
+            id_list = ','.join(batch)
+            if not self.cascades():
+                failed = False
+                for table in CHILD_TABLES:
+                    response = self.client.delete(f'/rest/v1/{table}?recipe_id=in.({id_list})')
+                    if response.status_code not in [200, 204]:
+                        print(f"❌ Could not delete {table} for {len(batch)} recipes: {response.status_code}")
+                        failed = True
+                if failed:
+                    continue
+
+            response = self.client.delete(
+                f"/rest/v1/recipes?id=in.({id_list})&select=id{'&' + filters if filters else ''}",
+                headers={'Prefer': 'return=representation'}
+            )
+            if response.status_code == 200:
+                deleted.extend(row['id'] for row in response.json())
+            else:
+                print(f"❌ Could not delete {len(batch)} recipes: {response.status_code} - {response.text}")
+        return deleted
+
+    def delete_names(self, names: List[str]) -> Dict[str, bool]:
+        """Delete every recipe with one of these names; True per name whose copies all went"""
+        names = list(dict.fromkeys(names))
+        ids_by_name = self.resolve_names(names)
+        for name in names:
+            if not ids_by_name[name]:
+                print(f"❌ Recipe '{name}' not found")
+        deleted = set(self.delete_ids([recipe_id for name in names for recipe_id in ids_by_name[name]]))
+        return {name: bool(ids_by_name[name]) and all(recipe_id in deleted for recipe_id in ids_by_name[name])
+                for name in names}
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Local SQLite Mirror of the Recipe Catalog
+Read-only tools query this instead of re-downloading recipes from Supabase;
+each refresh only pulls rows newer than the last sync watermark
+
+The watermarks rely on add_catalog_mirror_triggers.sql: the database stamps
+recipes.updated_at on every write to a recipe, its ingredients or its steps,
+so no client clock is involved. Run refresh(full=True) once after applying it
+to drop a watermark set from client-sent timestamps. What the watermarks still
+cannot see are ingredients renamed in place: ingredients only have created_at.
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote
+
+from supabase_client import SupabaseClient
+from supabase_pagination import iter_rows
+from supabase_stats import TableStats
+
+DEFAULT_MIRROR_PATH = '.catalog_mirror.sqlite3'
+
+# Table -> (watermark column, extra indexed columns)
+MIRRORED_TABLES = {
+    'recipes': ('updated_at', ['name', 'updated_at', 'created_at']),
+    'ingredients': ('created_at', ['name', 'created_at']),
+    'recipe_ingredients': ('created_at', ['recipe_id', 'ingredient_id', 'created_at']),
+    'preparation_steps': ('created_at', ['recipe_id', 'step_number', 'created_at'])
+}
+
+CHILD_TABLES = ['recipe_ingredients', 'preparation_steps']
+
+# Server stamps are taken when a transaction starts, so a slow one can commit a row
+# stamped behind a watermark that was already passed; each pull re-reads this far back
+WATERMARK_OVERLAP = timedelta(minutes=5)
+
+# Keep IN (...) lists well under URL length limits
+ID_BATCH_SIZE = 100
+UPSERT_BATCH_SIZE = 500
+
+# Tombstoned recipes are mirrored so their children can be tracked, but readers skip them
+LIVE_RECIPES = "json_extract(data, '$.deleted_at') IS NULL"
+
+
+def _rewind(watermark: str) -> str:
+    """The watermark moved back by WATERMARK_OVERLAP, in the same ISO format"""
+    try:
+        moment = datetime.fromisoformat(watermark.replace('Z', '+00:00'))
+    except ValueError:
+        return watermark
+    return (moment - WATERMARK_OVERLAP).isoformat()
+
+
+class CatalogMirror:
+    def __init__(self, client: SupabaseClient, path: str = DEFAULT_MIRROR_PATH):
+        self.client = client
+        self.path = path
+        self._lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self._create_schema()
+
+    def _create_schema(self):
+        with self.db:
+            for table, (_, columns) in MIRRORED_TABLES.items():
+                column_sql = ', '.join(columns)
+                self.db.execute(f'CREATE TABLE IF NOT EXISTS {table} (id TEXT PRIMARY KEY, {column_sql}, data TEXT NOT NULL)')
+                for column in columns:
+                    self.db.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_{column} ON {table}({column})')
+            self.db.execute('CREATE TABLE IF NOT EXISTS sync_state (table_name TEXT PRIMARY KEY, watermark TEXT)')
+
+    # Refresh
+
+    def refresh(self, full: bool = False) -> Dict[str, int]:
+        """Pull rows changed since the last watermark; full=True rebuilds from scratch
+
+        Returns rows pulled per table plus '<table>_deleted' counts. A refresh
+        with no upstream changes costs one small request and one HEAD per table.
+        """
+        with self._lock:
+            if full:
+                with self.db:
+                    for table in MIRRORED_TABLES:
+                        self.db.execute(f'DELETE FROM {table}')
+                    self.db.execute('DELETE FROM sync_state')
+
+            pulled = {}
+            changed_recipes: List[str] = []
+            for table in MIRRORED_TABLES:
+                pulled[table], changed = self._pull_changes(table)
+                if table == 'recipes':
+                    changed_recipes = changed
+
+            # Child rows have no updated_at; the server bumps the recipe on any write
+            # to its ingredients or steps, so re-pull the children of changed recipes
+            if changed_recipes and not full:
+                for table in CHILD_TABLES:
+                    pulled[table] += self._repull_children(table, changed_recipes)
+
+            for table in MIRRORED_TABLES:
+                fixed = self._reconcile(table)
+                pulled[table] += fixed['added']
+                pulled[f'{table}_deleted'] = fixed['deleted']
+            return pulled
+
+    def _pull_changes(self, table: str) -> Tuple[int, List[str]]:
+        """Upsert rows stamped since WATERMARK_OVERLAP before the watermark
+
+        Only rows that are new or carry a different stamp than the mirrored
+        copy are written and counted; the rest are overlap re-reads. Returns
+        (rows pulled, their ids). The first pull has no watermark and loads
+        everything, so it reports no changed ids.
+        """
+        watermark_column, _ = MIRRORED_TABLES[table]
+        watermark = self._get_watermark(table)
+        # gte, not gt: rows sharing the watermark timestamp may not all have been seen
+        filters = f'{watermark_column}=gte.{quote(_rewind(watermark))}' if watermark else ''
+
+        count = 0
+        newest = watermark
+        changed_ids = []
+        batch = []
+        for row in iter_rows(self.client, table, filters=filters):
+            batch.append(row)
+            value = row.get(watermark_column)
+            if value and (newest is None or value > newest):
+                newest = value
+            if len(batch) >= UPSERT_BATCH_SIZE:
+                count += self._upsert(table, self._changed(table, batch, changed_ids) if watermark else batch)
+                batch = []
+        count += self._upsert(table, self._changed(table, batch, changed_ids) if watermark else batch)
+
+        if newest != watermark:
+            with self.db:
+                self.db.execute('INSERT OR REPLACE INTO sync_state (table_name, watermark) VALUES (?, ?)', (table, newest))
+        return count, changed_ids
+
+    def _changed(self, table: str, rows: List[Dict[str, Any]], changed_ids: List[str]) -> List[Dict[str, Any]]:
+        """Rows missing locally or stamped differently, their ids appended to changed_ids"""
+        if not rows:
+            return []
+        watermark_column, _ = MIRRORED_TABLES[table]
+        placeholders = ','.join('?' for _ in rows)
+        known = dict(self.db.execute(f'SELECT id, {watermark_column} FROM {table} WHERE id IN ({placeholders})',
+                                     [row['id'] for row in rows]))
+        changed = [row for row in rows if row['id'] not in known or known[row['id']] != row.get(watermark_column)]
+        changed_ids.extend(row['id'] for row in changed)
+        return changed
+
+    def _repull_children(self, table: str, recipe_ids: List[str]) -> int:
+        count = 0
+        for start in range(0, len(recipe_ids), ID_BATCH_SIZE):
+            ids = recipe_ids[start:start + ID_BATCH_SIZE]
+            rows = list(iter_rows(self.client, table, filters=f"recipe_id=in.({','.join(ids)})"))
+            with self.db:
+                placeholders = ','.join('?' for _ in ids)
+                self.db.execute(f'DELETE FROM {table} WHERE recipe_id IN ({placeholders})', ids)
+            count += self._upsert(table, rows)
+        return count
+
+    def _reconcile(self, table: str) -> Dict[str, int]:
+        """Fix up rows the watermark cannot see; only lists ids when the counts disagree
+
+        Deleted rows leave no trace to pull, and child rows inserted with a
+        client-side created_at can land behind the watermark. An ingredient
+        renamed in place changes neither, so it stays stale until a full refresh.
+        """
+        if TableStats(self.client).count(table) == self.count(table):
+            return {'deleted': 0, 'added': 0}
+        remote_ids = {row['id'] for row in iter_rows(self.client, table, 'id')}
+        local_ids = {row[0] for row in self.db.execute(f'SELECT id FROM {table}')}
+
+        stale = sorted(local_ids - remote_ids)
+        with self.db:
+            self.db.executemany(f'DELETE FROM {table} WHERE id = ?', [(row_id,) for row_id in stale])
+
+        missing = sorted(remote_ids - local_ids)
+        added = 0
+        for start in range(0, len(missing), ID_BATCH_SIZE):
+            ids = missing[start:start + ID_BATCH_SIZE]
+            added += self._upsert(table, list(iter_rows(self.client, table, filters=f"id=in.({','.join(ids)})")))
+        return {'deleted': len(stale), 'added': added}
+
+    def _upsert(self, table: str, rows: List[Dict[str, Any]]) -> int:
+        if not rows:
+            return 0
+        _, columns = MIRRORED_TABLES[table]
+        names = ['id'] + columns + ['data']
+        sql = f"INSERT OR REPLACE INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' for _ in names)})"
+        with self.db:
+            self.db.executemany(sql, [
+                [row['id']] + [row.get(column) for column in columns] + [json.dumps(row)]
+                for row in rows
+            ])
+        return len(rows)
+
+    def _get_watermark(self, table: str) -> Optional[str]:
+        row = self.db.execute('SELECT watermark FROM sync_state WHERE table_name = ?', (table,)).fetchone()
+        return row[0] if row else None
+
+    # Queries
+
+    def count(self, table: str) -> int:
+        return self.db.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+
+    def rows(self, table: str, where: str = '', params: Iterable[Any] = (), order_by: str = 'id',
+             limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Full rows of a mirrored table as dicts"""
+        sql = f'SELECT data FROM {table}'
+        if where:
+            sql += f' WHERE {where}'
+        sql += f' ORDER BY {order_by}'
+        if limit is not None:
+            sql += f' LIMIT {int(limit)}'
+        return [json.loads(row[0]) for row in self.db.execute(sql, list(params))]
+
+    def recipes(self, include_deleted: bool = False) -> List[Dict[str, Any]]:
+        return self.rows('recipes', '' if include_deleted else LIVE_RECIPES, order_by='name')
+
+    def ingredient_counts(self) -> List[Dict[str, Any]]:
+        """Ingredients per live recipe, for recipes that have any"""
+        return [dict(row) for row in self.db.execute(
+            'SELECT r.id, r.name, COUNT(ri.id) AS ingredient_count FROM recipes r '
+            'JOIN recipe_ingredients ri ON ri.recipe_id = r.id '
+            "WHERE json_extract(r.data, '$.deleted_at') IS NULL GROUP BY r.id ORDER BY r.name"
+        )]
+
+    def get_recipe(self, recipe_id: Optional[str] = None, name: Optional[str] = None,
+                   include_deleted: bool = False) -> Optional[Dict[str, Any]]:
+        """A recipe shaped like RecipeInspector's embedded result"""
+        live = '' if include_deleted else f' AND {LIVE_RECIPES}'
+        if recipe_id:
+            matches = self.rows('recipes', 'id = ?' + live, [recipe_id])
+        elif name:
+            matches = self.rows('recipes', 'name = ?' + live, [name])
+        else:
+            raise ValueError("Pass a recipe_id or a name")
+        if not matches:
+            return None
+
+        recipe = matches[0]
+        ingredient_names = {
+            row['id']: row['name'] for row in self.db.execute(
+                'SELECT i.id, i.name FROM ingredients i JOIN recipe_ingredients ri ON ri.ingredient_id = i.id '
+                'WHERE ri.recipe_id = ?', (recipe['id'],)
+            )
+        }
+        recipe['recipe_ingredients'] = [
+            dict(link, ingredients={'name': ingredient_names[link['ingredient_id']]} if link.get('ingredient_id') in ingredient_names else None)
+            for link in self.rows('recipe_ingredients', 'recipe_id = ?', [recipe['id']], order_by='created_at, id')
+        ]
+        recipe['preparation_steps'] = self.rows('preparation_steps', 'recipe_id = ?', [recipe['id']], order_by='step_number')
+        return recipe
+
+    def close(self):
+        self.db.close()
@@ -4,9 +4,11 @@ Glucko Recipe Ingredients Check Script
 Checks which recipes have ingredients and which are missing them
 """
 
-import requests
 import json
 
+from recipe_inspection import RecipeInspector
+from supabase_client import SupabaseClient
+
 class RecipeIngredientChecker:
     def __init__(self, supabase_url: str, supabase_key: str):
         self.supabase_url = supabase_url.rstrip('/')
@@ -17,43 +19,16 @@ class RecipeIngredientChecker:
             'Content-Type': 'application/json',
             'Prefer': 'return=minimal'
         }
+        self.inspector = RecipeInspector(SupabaseClient(supabase_url, supabase_key))
     
     def get_all_recipes(self):
-        """Get all recipes from the database"""
+        """Get all recipes with their ingredients embedded, a page at a time"""
         try:
-            response = requests.get(
-                f'{self.supabase_url}/rest/v1/recipes',
-                headers=self.headers
-            )
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                print(f"❌ Failed to fetch recipes: {response.text}")
-                return []
-                
+            return self.inspector.get_all_recipes()
         except Exception as e:
             print(f"❌ Error fetching recipes: {str(e)}")
             return []
     
-    def get_recipe_ingredients(self, recipe_id: str):
-        """Get ingredients for a specific recipe"""
-        try:
-            response = requests.get(
-                f'{self.supabase_url}/rest/v1/recipe_ingredients?recipe_id=eq.{recipe_id}',
-                headers=self.headers
-            )
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                print(f"❌ Failed to fetch ingredients for recipe {recipe_id}: {response.text}")
-                return []
-                
-        except Exception as e:
-            print(f"❌ Error fetching ingredients for recipe {recipe_id}: {str(e)}")
-            return []
-    
     def check_all_recipes(self):
         """Check all recipes for missing ingredients"""
         print("🔍 Checking recipes for ingredients...")
@@ -73,9 +48,7 @@ class RecipeIngredientChecker:
         
         for recipe in recipes:
             recipe_name = recipe['name']
-            recipe_id = recipe['id']
-            
-            ingredients = self.get_recipe_ingredients(recipe_id)
+            ingredients = recipe['recipe_ingredients']
             
             if ingredients:
                 recipes_with_ingredients.append(recipe_name)
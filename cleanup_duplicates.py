@@ -4,11 +4,16 @@ Glucko Recipe Duplicate Cleanup Script
 Removes duplicate recipes from the Supabase database
 """
 
-import requests
 import json
 from typing import List, Dict, Any
 from collections import defaultdict
 
+from bulk_delete import BulkRecipeDeleter
+from integrity_checker import load_tables
+from near_duplicates import NearDuplicateDetector
+from supabase_client import SupabaseClient
+from supabase_pagination import iter_rows
+
 class DuplicateCleaner:
     def __init__(self, supabase_url: str, supabase_key: str):
         self.supabase_url = supabase_url.rstrip('/')
@@ -19,20 +24,15 @@ class DuplicateCleaner:
             'Content-Type': 'application/json',
             'Prefer': 'return=minimal'
         }
+        self.client = SupabaseClient(supabase_url, supabase_key)
+        self.bulk = BulkRecipeDeleter(self.client)
     
     def get_all_recipes(self) -> List[Dict[str, Any]]:
-        """Fetch all recipes from the database"""
+        """Fetch all live recipes from the database"""
         try:
-            response = requests.get(
-                f'{self.supabase_url}/rest/v1/recipes',
-                headers=self.headers
-            )
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                print(f"❌ Failed to fetch recipes: {response.text}")
-                return []
+            # Page by id so tables larger than PostgREST's max-rows are read in full;
+            # a tombstone is not a duplicate of the live recipe that replaced it
+            return list(iter_rows(self.client, 'recipes', filters='deleted_at=is.null'))
                 
         except Exception as e:
             print(f"❌ Error fetching recipes: {str(e)}")
@@ -49,28 +49,30 @@ class DuplicateCleaner:
         # Filter to only include names with duplicates
         return {name: recipes for name, recipes in duplicates.items() if len(recipes) > 1}
     
-    def delete_recipe(self, recipe_id: str) -> bool:
-        """Delete a recipe and its related data"""
+    def find_near_duplicates(self) -> List[Dict[str, Any]]:
+        """Clusters of recipes with similar ingredients and names, most similar first"""
         try:
-            # Delete recipe ingredients
-            response = requests.delete(
-                f'{self.supabase_url}/rest/v1/recipe_ingredients?recipe_id=eq.{recipe_id}',
-                headers=self.headers
-            )
-            
-            # Delete preparation steps
-            response = requests.delete(
-                f'{self.supabase_url}/rest/v1/preparation_steps?recipe_id=eq.{recipe_id}',
-                headers=self.headers
-            )
+            return NearDuplicateDetector().find(load_tables(self.client))['clusters']
             
-            # Delete the recipe itself
-            response = requests.delete(
-                f'{self.supabase_url}/rest/v1/recipes?id=eq.{recipe_id}',
-                headers=self.headers
-            )
-            
-            return response.status_code in [200, 204]
+        except Exception as e:
+            print(f"❌ Error finding near duplicates: {str(e)}")
+            return []
+    
+    def delete_near_duplicates(self, clusters: List[Dict[str, Any]], dry_run: bool = True) -> int:
+        """Delete the recipes in each cluster that are themselves similar enough to the one it keeps
+
+        Members only linked to the kept recipe through another member are left alone.
+        """
+        recipe_ids = [recipe['id'] for cluster in clusters for recipe in cluster['recipes'] if recipe['duplicate']]
+        if dry_run:
+            print(f"🔍 DRY RUN - would delete {len(recipe_ids)} near-duplicate recipes")
+            return 0
+        return len(self.bulk.delete_ids(recipe_ids))
+    
+    def delete_recipe(self, recipe_id: str) -> bool:
+        """Delete a recipe; its ingredients and steps go with it via ON DELETE CASCADE"""
+        try:
+            return recipe_id in self.bulk.delete_ids([recipe_id])
             
         except Exception as e:
             print(f"❌ Error deleting recipe {recipe_id}: {str(e)}")
@@ -103,19 +105,20 @@ class DuplicateCleaner:
             return {'total': len(recipes), 'duplicates': len(duplicates), 'deleted': 0}
         
         print(f"\n🗑️  Starting cleanup...")
-        deleted_count = 0
+        # Keep the first recipe of each name, delete the rest in batches
+        recipes_to_delete = [recipe for duplicate_recipes in duplicates.values() for recipe in duplicate_recipes[1:]]
+        try:
+            deleted = set(self.bulk.delete_ids([recipe['id'] for recipe in recipes_to_delete]))
+        except Exception as e:
+            print(f"❌ Error deleting duplicates: {str(e)}")
+            deleted = set()
         
-        for name, duplicate_recipes in duplicates.items():
-            # Keep the first recipe, delete the rest
-            recipes_to_delete = duplicate_recipes[1:]
-            
-            for recipe in recipes_to_delete:
-                print(f"🗑️  Deleting duplicate: {name} (ID: {recipe['id']})")
-                if self.delete_recipe(recipe['id']):
-                    deleted_count += 1
-                    print(f"✅ Deleted successfully")
-                else:
-                    print(f"❌ Failed to delete")
+        for recipe in recipes_to_delete:
+            if recipe['id'] in deleted:
+                print(f"✅ Deleted duplicate: {recipe['name']} (ID: {recipe['id']})")
+            else:
+                print(f"❌ Failed to delete duplicate: {recipe['name']} (ID: {recipe['id']})")
+        deleted_count = len(deleted)
         
         return {'total': len(recipes), 'duplicates': len(duplicates), 'deleted': deleted_count}
 
@@ -146,6 +149,15 @@ def main():
         print(f"🗑️  Deleted: {results['deleted']}")
     else:
         print("✅ No cleanup needed!")
+    
+    # Near duplicates need a human look before anything is deleted
+    clusters = cleaner.find_near_duplicates()
+    if clusters:
+        print(f"\n🔗 {len(clusters)} near-duplicate clusters to review (see near_duplicates.py):")
+        for cluster in clusters:
+            names = ', '.join(recipe['name'] if recipe['id'] == cluster['keep'] else f"{recipe['name']} ({recipe['score']:.2f})"
+                              for recipe in cluster['recipes'])
+            print(f"  • {cluster['score']:.2f}: {names}")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
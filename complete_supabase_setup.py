@@ -4,11 +4,16 @@ Complete Supabase Setup Guide
 This script will help you set up your Supabase database properly
 """
 
-import requests
 import json
 import os
 from datetime import datetime
 
+from image_manifest import ImageManifest
+from image_url_checker import ImageUrlChecker, image_columns, image_urls_for_recipe
+from supabase_client import SupabaseClient
+from supabase_pagination import iter_rows
+from supabase_stats import RECIPE_TABLES, TableStats
+
 class SupabaseSetupGuide:
     def __init__(self, supabase_url: str, supabase_key: str):
         self.supabase_url = supabase_url.rstrip('/')
@@ -19,62 +24,22 @@ class SupabaseSetupGuide:
             'Content-Type': 'application/json',
             'Prefer': 'return=minimal'
         }
+        self.client = SupabaseClient(supabase_url, supabase_key)
     
     def check_current_status(self):
         """Check what's currently in the database"""
         print("🔍 Checking current database status...")
         
-        # Check recipes table
-        try:
-            response = requests.get(
-                f'{self.supabase_url}/rest/v1/recipes?select=count',
-                headers=self.headers
-            )
-            if response.status_code == 200:
-                print("✅ Recipes table exists")
-            else:
-                print("❌ Recipes table not found")
-        except:
-            print("❌ Cannot access recipes table")
-        
-        # Check ingredients table
-        try:
-            response = requests.get(
-                f'{self.supabase_url}/rest/v1/ingredients?select=count',
-                headers=self.headers
-            )
-            if response.status_code == 200:
-                print("✅ Ingredients table exists")
-            else:
-                print("❌ Ingredients table not found")
-        except:
-            print("❌ Cannot access ingredients table")
-        
-        # Check preparation_steps table
-        try:
-            response = requests.get(
-                f'{self.supabase_url}/rest/v1/preparation_steps?select=count',
-                headers=self.headers
-            )
-            if response.status_code == 200:
-                print("✅ Preparation_steps table exists")
-            else:
-                print("❌ Preparation_steps table not found")
-        except:
-            print("❌ Cannot access preparation_steps table")
-        
-        # Check recipe_ingredients table
-        try:
-            response = requests.get(
-                f'{self.supabase_url}/rest/v1/recipe_ingredients?select=count',
-                headers=self.headers
-            )
-            if response.status_code == 200:
-                print("✅ Recipe_ingredients table exists")
+        # One HEAD per table; only the Content-Range count comes back
+        counts = TableStats(self.client).table_counts(RECIPE_TABLES)
+        for table, result in counts.items():
+            label = table.capitalize()
+            if result['count'] is not None:
+                print(f"✅ {label} table exists ({result['count']} rows)")
+            elif result['status'] == 404:
+                print(f"❌ {label} table not found")
             else:
-                print("❌ Recipe_ingredients table not found")
-        except:
-            print("❌ Cannot access recipe_ingredients table")
+                print(f"❌ Cannot access {table} table")
     
     def print_setup_instructions(self):
         """Print step-by-step setup instructions"""
@@ -95,22 +60,8 @@ class SupabaseSetupGuide:
         print("1. Go to Storage in your Supabase Dashboard")
         print("2. Create a bucket called 'recipe-images' (if it doesn't exist)")
         print("3. Set the bucket to public")
-        print("4. Upload these 12 images from your recipe_images/ folder:")
-        
-        images = [
-            "quick_chickpea_stew.png",
-            "grilled_chicken_salad.png", 
-            "toast_with_savory_jam.png",
-            "musli_with_pumpkin_seeds.png",
-            "omelette-with_feta.png",
-            "halloumi_with_spinach.png",
-            "quiche_with_peas_cheese.png",
-            "californian_quesadilla.png",
-            "muffin_with_mushrooms.png",
-            "salmon_toast.png",
-            "spinach_and_sausage.png",
-            "avocado_toast_with_prosciutto.png"
-        ]
+        images = ImageManifest.load().keys()
+        print(f"4. Upload these {len(images)} images from your recipe_images/ folder:")
         
         for i, image in enumerate(images, 1):
             print(f"   {i:2d}. {image}")
@@ -135,32 +86,50 @@ class SupabaseSetupGuide:
         print("\n🖼️  Testing Recipe Image URLs...")
         
         try:
-            response = requests.get(
-                f'{self.supabase_url}/rest/v1/recipes?select=name,image_url',
-                headers=self.headers
-            )
+            try:
+                recipes = list(iter_rows(self.client, 'recipes', ','.join(['id', 'name'] + image_columns(self.client))))
+            except RuntimeError:
+                recipes = None
             
-            if response.status_code == 200:
-                recipes = response.json()
-                working_urls = 0
+            if recipes is not None:
                 total_recipes = len(recipes)
                 
+                # Check every image URL and variant at once instead of one HEAD at a time
+                targets = []
                 for recipe in recipes:
-                    if recipe.get('image_url'):
-                        # Test if the image URL is accessible
-                        try:
-                            img_response = requests.head(recipe['image_url'], timeout=5)
-                            if img_response.status_code == 200:
-                                print(f"✅ {recipe['name']}: Image accessible")
-                                working_urls += 1
-                            else:
-                                print(f"❌ {recipe['name']}: Image not accessible (Status: {img_response.status_code})")
-                        except:
-                            print(f"❌ {recipe['name']}: Image URL error")
-                    else:
+                    urls = image_urls_for_recipe(recipe)
+                    if not urls:
                         print(f"⚠️  {recipe['name']}: No image URL")
+                    targets.extend((recipe['name'], url) for url in urls)
+                
+                checker = ImageUrlChecker()
+                results = checker.check(targets)
+                
+                # A recipe counts as working only if its image and every variant respond
+                checked_recipes = set()
+                broken_recipes = set()
+                for result in results:
+                    checked_recipes.add(result['label'])
+                    if result['ok']:
+                        cached = " (unchanged)" if result['status'] == 304 else ""
+                        print(f"✅ {result['label']}: Image accessible{cached}")
+                    elif result['status'] is not None:
+                        print(f"❌ {result['label']}: Image not accessible (Status: {result['status']})")
+                        broken_recipes.add(result['label'])
+                    else:
+                        print(f"❌ {result['label']}: Image URL error")
+                        broken_recipes.add(result['label'])
+                working_urls = len(checked_recipes - broken_recipes)
                 
+                summary = checker.summarize(results)
+                latency = summary['latency_ms']
                 print(f"\n📊 Image URL Results: {working_urls}/{total_recipes} working")
+                print(f"   URLs checked: {summary['checked']} ({summary['not_modified']} unchanged since last run)")
+                print(f"   Status codes: {summary['status_counts']}")
+                print(f"   Total size: {summary['total_bytes'] / 1024:.0f} KB")
+                if latency['p50'] is not None:
+                    print(f"   Latency: p50 {latency['p50']:.0f} ms, p90 {latency['p90']:.0f} ms, "
+                          f"p99 {latency['p99']:.0f} ms, max {latency['max']:.0f} ms")
             else:
                 print("❌ Cannot fetch recipes")
                 
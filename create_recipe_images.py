@@ -4,6 +4,8 @@ import os
 from PIL import Image, ImageDraw, ImageFont
 import io
 
+from image_manifest import ImageManifest
+
 class RecipeImageCreator:
     def __init__(self):
         self.output_dir = "recipe_images"
@@ -95,6 +97,7 @@ class RecipeImageCreator:
             print(f"📁 Loaded {len(recipes)} recipes from {recipes_file}")
             print(f"🚀 Creating placeholder images in '{self.output_dir}' directory...")
             
+            manifest = ImageManifest.load()
             successful = 0
             failed = 0
             created_files = []
@@ -102,23 +105,7 @@ class RecipeImageCreator:
             for recipe in recipes:
                 recipe_name = recipe['name']
                 
-                # Create filename from recipe name with custom mapping
-                filename_mapping = {
-                    "Quick Chickpea Stew": "quick_chickpea_stew.png",
-                    "Grilled Chicken Salad": "grilled_chicken_salad.png",
-                    "Toast with Savory Jam": "toast_with_savory_jam.png",
-                    "Muesli Without Spikes": "musli_with_pumpkin_seeds.png",
-                    "My OMELETTE": "omelette-with-feta.png",
-                    "Happy Halloumi": "halloumi_with_spinach.png",
-                    "Comforting Quiche": "quiche_with_peas_cheese.png",
-                    "Californian Quesadilla": "californian_quesadilla.png",
-                    "Egg Muffins": "muffin_with_mushrooms.png",
-                    "Salmon Toast": "salmon_toast.png",
-                    "Spinach & Sausage": "spinach_and_sausage.png",
-                    "Avocado Toast with prosciutto": "avocado_toast_with_prosciutto.png"
-                }
-                
-                filename = filename_mapping.get(recipe_name, f"{recipe_name.lower().replace(' ', '_').replace('&', 'and').replace('(', '').replace(')', '')}.png")
+                filename = manifest.key_for(recipe_name, recipe.get('id'))
                 
                 # Create placeholder image
                 print(f"🎨 Creating placeholder for: {recipe_name}")
@@ -7,6 +7,11 @@ Fixes missing ingredients for specific recipes
 import requests
 import json
 
+from catalog_mirror import CatalogMirror
+from ingredient_canonicalizer import IngredientResolver
+from name_search import CatalogSearch
+from supabase_client import SupabaseClient
+
 class MissingIngredientsFixer:
     def __init__(self, supabase_url: str, supabase_key: str):
         self.supabase_url = supabase_url.rstrip('/')
@@ -17,13 +22,25 @@ class MissingIngredientsFixer:
             'Content-Type': 'application/json',
             'Prefer': 'return=minimal'
         }
+        self.client = SupabaseClient(supabase_url, supabase_key)
+        self.ingredients = IngredientResolver(self.client)
+        self._search = None
+    
+    @property
+    def search(self) -> CatalogSearch:
+        """Fuzzy name index over the local catalog mirror, refreshed on first use"""
+        if self._search is None:
+            mirror = CatalogMirror(self.client)
+            mirror.refresh()
+            self._search = CatalogSearch(mirror)
+        return self._search
     
     def get_recipe_by_name(self, recipe_name: str):
         """Get recipe by name (with fuzzy matching)"""
         try:
             # Try exact match first
             response = requests.get(
-                f'{self.supabase_url}/rest/v1/recipes?name=eq.{recipe_name}',
+                f'{self.supabase_url}/rest/v1/recipes?name=eq.{recipe_name}&deleted_at=is.null',
                 headers=self.headers
             )
             
@@ -32,17 +49,16 @@ class MissingIngredientsFixer:
                 if recipes:
                     return recipes[0]
             
-            # Try partial match
-            response = requests.get(
-                f'{self.supabase_url}/rest/v1/recipes?name=ilike.*{recipe_name}*',
-                headers=self.headers
-            )
-            
-            if response.status_code == 200:
-                recipes = response.json()
-                if recipes:
-                    return recipes[0]
+            # Fall back to the closest name in the local trigram index, but only when it is unambiguous
+            match, candidates = self.search.recipes.best_match(recipe_name)
+            if match:
+                print(f"🔎 Using closest match '{match['name']}' for '{recipe_name}' ({match['score']:.2f})")
+                return match['value']
             
+            if candidates:
+                print(f"❓ No confident match for '{recipe_name}'; candidates:")
+                for candidate in candidates:
+                    print(f"   {candidate['score']:.2f}  {candidate['name']}")
             return None
                 
         except Exception as e:
@@ -52,29 +68,20 @@ class MissingIngredientsFixer:
     def ensure_ingredient_exists(self, ingredient_name: str) -> str:
         """Ensure ingredient exists, create if it doesn't"""
         try:
-            # Check if ingredient exists
-            response = requests.get(
-                f'{self.supabase_url}/rest/v1/ingredients?name=eq.{ingredient_name}',
-                headers=self.headers
-            )
+            # The same name or a spelling variant of it ('Tomatoes' for 'Tomato') reuses the existing row
+            ingredient_id = self.ingredients.find(ingredient_name)
+            if ingredient_id:
+                return ingredient_id
             
-            if response.status_code == 200:
-                ingredients = response.json()
-                if ingredients:
-                    return ingredients[0]['id']
+            # Similar names can be different ingredients ('Red pepper', 'Pepper'): list them, never link them
+            for match in self.search.similar_ingredients(ingredient_name):
+                print(f"⚠️  New ingredient '{ingredient_name}' looks like existing '{match['name']}' ({match['score']:.2f})")
             
             # Create ingredient if it doesn't exist
-            create_response = requests.post(
-                f'{self.supabase_url}/rest/v1/ingredients',
-                headers=self.headers,
-                json={'name': ingredient_name}
-            )
-            
-            if create_response.status_code in [200, 201]:
-                return create_response.json()[0]['id']
-            else:
-                print(f"❌ Failed to create ingredient {ingredient_name}: {create_response.text}")
-                return None
+            ingredient_id = self.ingredients.resolve(ingredient_name)
+            if ingredient_id is None:
+                print(f"❌ Failed to create ingredient {ingredient_name}")
+            return ingredient_id
                 
         except Exception as e:
             print(f"❌ Error ensuring ingredient exists {ingredient_name}: {str(e)}")
@@ -202,8 +202,7 @@ class RecipeFixer:
                 'protein': recipe_data['protein'],
                 'carbs': recipe_data['carbs'],
                 'fats': recipe_data['fat'],
-                'calories': recipe_data['calories'],
-                'updated_at': datetime.now().isoformat()
+                'calories': recipe_data['calories']
             }
             
             update_response = requests.patch(
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+HTTP Record/Replay for SupabaseClient
+Appends every exchange to a JSONL file and serves recorded responses back
+offline, so request counts and payload sizes can be compared between versions
+"""
+
+import base64
+import hashlib
+import io
+import json
+import threading
+from collections import defaultdict, deque
+from typing import Any, Dict, List, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from urllib3 import HTTPResponse
+
+from supabase_metrics import endpoint_label
+
+DEFAULT_RECORDING_FILE = 'http_recording.jsonl'
+
+# Response headers the scripts read; everything else is dropped from recordings
+RECORDED_HEADERS = ['Content-Type', 'Content-Range', 'Content-Length', 'ETag', 'Location',
+                    'Upload-Offset', 'Upload-Length', 'Tus-Resumable']
+
+
+def body_digest(body: Any) -> Optional[str]:
+    """SHA-256 of a request body; None for streamed bodies such as open files"""
+    if body is None:
+        return None
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    if isinstance(body, bytes):
+        return hashlib.sha256(body).hexdigest()
+    return None
+
+
+def body_size(body: Any) -> Optional[int]:
+    """Bytes in a request body; a streamed relay reports what it forwarded, other streams None"""
+    if body is None:
+        return 0
+    if isinstance(body, (bytes, str)):
+        return len(body)
+    return getattr(body, 'bytes_relayed', None)
+
+
+class HttpRecorder:
+    """Appends one JSON line per request; safe to share between threads"""
+
+    def __init__(self, path: str = DEFAULT_RECORDING_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._sequence = 0
+
+    def record(self, prepared: requests.PreparedRequest, response: requests.Response, elapsed: float):
+        """Append one exchange; a streamed response is read here and handed back re-wrapped for the caller"""
+        content = response.content
+        response.raw = HTTPResponse(body=io.BytesIO(content), headers=dict(response.headers),
+                                    status=response.status_code, preload_content=False)
+        try:
+            response_body, encoding = content.decode('utf-8'), 'utf-8'
+        except UnicodeDecodeError:
+            response_body, encoding = base64.b64encode(content).decode('ascii'), 'base64'
+
+        request_bytes = body_size(prepared.body)
+        if request_bytes is None:
+            request_bytes = int(prepared.headers.get('Content-Length') or 0)
+
+        with self._lock:
+            self._sequence += 1
+            entry = {
+                'seq': self._sequence,
+                'method': prepared.method,
+                'url': prepared.url,
+                'endpoint': endpoint_label(prepared.url),
+                'request_sha256': body_digest(prepared.body),
+                'request_bytes': request_bytes,
+                'status': response.status_code,
+                'headers': {name: response.headers[name] for name in RECORDED_HEADERS if name in response.headers},
+                'response_bytes': len(content),
+                'response_sha256': hashlib.sha256(content).hexdigest(),
+                'response_encoding': encoding,
+                'response_body': response_body,
+                'elapsed_seconds': round(elapsed, 6)
+            }
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(entry, separators=(',', ':')) + '\n')
+
+
+class ReplayMiss(requests.ConnectionError):
+    """No recorded response is left for a request; scripts see it as a network failure"""
+
+
+class HttpReplayer:
+    """Serves recorded responses in the order they were recorded, per method and URL
+
+    Bodies that embed timestamps never hash the same twice, so requests are
+    matched on method and URL only; a different body is counted as a changed
+    payload rather than a miss.
+    """
+
+    def __init__(self, path: str = DEFAULT_RECORDING_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._queues: Dict[tuple, deque] = defaultdict(deque)
+        for entry in load_recording(path):
+            self._queues[(entry['method'], entry['url'])].append(entry)
+        self.served = 0
+        self.misses: List[str] = []
+        self.changed_payloads: List[str] = []
+
+    def respond(self, prepared: requests.PreparedRequest) -> requests.Response:
+        with self._lock:
+            queue = self._queues.get((prepared.method, prepared.url))
+            if not queue:
+                self.misses.append(f'{prepared.method} {prepared.url}')
+                raise ReplayMiss(f"No recorded response for {prepared.method} {prepared.url}", request=prepared)
+            entry = queue.popleft()
+            self.served += 1
+            digest = body_digest(prepared.body)
+            if digest and entry['request_sha256'] and digest != entry['request_sha256']:
+                self.changed_payloads.append(f'{prepared.method} {prepared.url}')
+        return build_response(prepared, entry)
+
+    def unused(self) -> int:
+        """Recorded exchanges the replayed run never asked for"""
+        with self._lock:
+            return sum(len(queue) for queue in self._queues.values())
+
+
+def build_response(prepared: requests.PreparedRequest, entry: Dict[str, Any]) -> requests.Response:
+    """A requests.Response carrying the recorded status, headers and body
+
+    The body is also exposed through response.raw so stream=True callers can read it.
+    """
+    if entry['response_encoding'] == 'base64':
+        content = base64.b64decode(entry['response_body'])
+    else:
+        content = entry['response_body'].encode('utf-8')
+
+    response = requests.Response()
+    response.status_code = entry['status']
+    response.headers = CaseInsensitiveDict(entry['headers'])
+    response.raw = HTTPResponse(body=io.BytesIO(content), headers=entry['headers'], status=entry['status'],
+                                preload_content=False)
+    response._content = content
+    response.url = prepared.url
+    response.request = prepared
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    return response
+
+
+def load_recording(path: str) -> List[Dict[str, Any]]:
+    with open(path, 'r') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def summarize_recording(entries: List[Dict[str, Any]]) -> Dict[str, Dict[str, int]]:
+    """Requests and bytes per method and endpoint"""
+    summary: Dict[str, Dict[str, int]] = defaultdict(lambda: {'requests': 0, 'request_bytes': 0, 'response_bytes': 0})
+    for entry in entries:
+        stats = summary[f"{entry['method']} {entry['endpoint']}"]
+        stats['requests'] += 1
+        stats['request_bytes'] += entry['request_bytes']
+        stats['response_bytes'] += entry['response_bytes']
+    return dict(summary)
+
+
+def compare_recordings(baseline: List[Dict[str, Any]], current: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Per-endpoint differences; more requests to one endpoint is how an N+1 shows up"""
+    before, after = summarize_recording(baseline), summarize_recording(current)
+    changes = []
+    empty = {'requests': 0, 'request_bytes': 0, 'response_bytes': 0}
+    for endpoint in sorted(set(before) | set(after)):
+        old, new = before.get(endpoint, empty), after.get(endpoint, empty)
+        if old != new:
+            changes.append({'endpoint': endpoint, 'before': old, 'after': new})
+    return changes
+
+
+def main():
+    BASELINE_FILE = 'http_recording.baseline.jsonl'
+    CURRENT_FILE = DEFAULT_RECORDING_FILE
+
+    print("🎞️  HTTP Recording Comparison")
+    print("=" * 50)
+
+    baseline, current = load_recording(BASELINE_FILE), load_recording(CURRENT_FILE)
+    print(f"📼 Baseline: {len(baseline)} requests ({BASELINE_FILE})")
+    print(f"📼 Current: {len(current)} requests ({CURRENT_FILE})")
+
+    changes = compare_recordings(baseline, current)
+    if not changes:
+        print("✅ Same requests and payload sizes")
+        return
+    for change in changes:
+        old, new = change['before'], change['after']
+        marker = '📈' if new['requests'] > old['requests'] else '📉' if new['requests'] < old['requests'] else '↔️ '
+        print(f"{marker} {change['endpoint']}: {old['requests']} → {new['requests']} requests, "
+              f"{old['request_bytes']} → {new['request_bytes']}B sent, "
+              f"{old['response_bytes']} → {new['response_bytes']}B received")
+
+
+if __name__ == "__main__":
+    main()
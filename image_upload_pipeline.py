@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Concurrent Image Upload Pipeline
+Runs image uploads with a bounded number of transfers in flight
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from supabase_metrics import RequestMetrics
+
+# A job is (filename, payload); the payload is whatever the worker needs
+# to produce the bytes (a path, a URL, a recipe dict), never the bytes
+# themselves, so queued jobs stay cheap no matter how large the images are.
+UploadJob = Tuple[str, Any]
+
+
+class ImageUploadPipeline:
+    def __init__(self, max_in_flight: int = 8, metrics: Optional[RequestMetrics] = None):
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        self.max_in_flight = max_in_flight
+        # Each job is timed as an 'upload_image' span when metrics are given
+        self.metrics = metrics
+
+    def _span(self):
+        return self.metrics.span('upload_image') if self.metrics else nullcontext()
+
+    def run(self, jobs: Iterable[UploadJob], worker: Callable[[str, Any], bool]) -> Dict[str, Any]:
+        """Upload every job on a thread pool, at most max_in_flight at a time"""
+        jobs = list(jobs)
+        results = self._new_results(len(jobs))
+        started = time.monotonic()
+
+        print(f"🚀 Uploading {len(jobs)} images with up to {self.max_in_flight} concurrent transfers...")
+
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            futures = {
+                executor.submit(self._timed_call, worker, filename, payload): filename
+                for filename, payload in jobs
+            }
+            for future in as_completed(futures):
+                ok, elapsed = future.result()
+                self._record(results, futures[future], ok, elapsed)
+
+        results['elapsed'] = time.monotonic() - started
+        return results
+
+    async def run_async(self, jobs: Iterable[UploadJob], worker: Callable[[str, Any], Any]) -> Dict[str, Any]:
+        """Upload every job on the event loop, at most max_in_flight at a time
+
+        The worker may be a coroutine function or a plain blocking function;
+        blocking workers are moved onto threads so they do not stall the loop.
+        """
+        jobs = list(jobs)
+        results = self._new_results(len(jobs))
+        semaphore = asyncio.Semaphore(self.max_in_flight)
+        started = time.monotonic()
+
+        print(f"🚀 Uploading {len(jobs)} images with up to {self.max_in_flight} concurrent transfers...")
+
+        async def upload_one(filename: str, payload: Any):
+            async with semaphore:
+                job_started = time.monotonic()
+                try:
+                    with self._span():
+                        if asyncio.iscoroutinefunction(worker):
+                            ok = await worker(filename, payload)
+                        else:
+                            ok = await asyncio.to_thread(worker, filename, payload)
+                except Exception as e:
+                    print(f"❌ Error uploading {filename}: {str(e)}")
+                    ok = False
+                self._record(results, filename, bool(ok), time.monotonic() - job_started)
+
+        await asyncio.gather(*(upload_one(filename, payload) for filename, payload in jobs))
+
+        results['elapsed'] = time.monotonic() - started
+        return results
+
+    def _timed_call(self, worker: Callable[[str, Any], bool], filename: str, payload: Any) -> Tuple[bool, float]:
+        started = time.monotonic()
+        try:
+            with self._span():
+                ok = bool(worker(filename, payload))
+        except Exception as e:
+            print(f"❌ Error uploading {filename}: {str(e)}")
+            ok = False
+        return ok, time.monotonic() - started
+
+    def _new_results(self, total: int) -> Dict[str, Any]:
+        return {'successful': 0, 'failed': 0, 'total': total, 'failures': [], 'elapsed': 0.0}
+
+    def _record(self, results: Dict[str, Any], filename: str, ok: bool, elapsed: float):
+        if ok:
+            results['successful'] += 1
+        else:
+            results['failed'] += 1
+            results['failures'].append(filename)
+
+        done = results['successful'] + results['failed']
+        status = "✅" if ok else "❌"
+        print(f"   [{done}/{results['total']}] {status} {filename} ({elapsed:.1f}s)")
+
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Concurrent Image URL Health Checker
+Checks recipe image URLs in parallel, using cached ETags so unchanged images cost a 304
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+from supabase_client import SupabaseClient
+
+DEFAULT_CACHE_FILE = '.image_url_cache.json'
+
+
+def image_urls_for_recipe(recipe: Dict[str, Any]) -> List[str]:
+    """The primary image_url followed by any image_*_url variant columns"""
+    urls = []
+    if recipe.get('image_url'):
+        urls.append(recipe['image_url'])
+    for key in sorted(recipe):
+        if key != 'image_url' and key.startswith('image_') and key.endswith('_url') and recipe[key]:
+            urls.append(recipe[key])
+    return urls
+
+
+def image_columns(client: SupabaseClient) -> List[str]:
+    """image_url plus whatever image_*_url variant columns recipes has, read from one row"""
+    response = client.get('/rest/v1/recipes?select=*&limit=1')
+    if response.status_code != 200:
+        raise RuntimeError(f"Failed to fetch recipes: {response.status_code} - {response.text}")
+    rows = response.json()
+    variants = sorted(column for column in (rows[0] if rows else {})
+                      if column != 'image_url' and column.startswith('image_') and column.endswith('_url'))
+    return ['image_url'] + variants
+
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of a list of latencies"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class ImageUrlChecker:
+    def __init__(self, cache_file: str = DEFAULT_CACHE_FILE, max_workers: int = 32, timeout: float = 5):
+        self.cache_file = cache_file
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._local = threading.local()
+
+    @property
+    def session(self) -> requests.Session:
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            self._local.session = session
+        return session
+
+    def check(self, targets: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """HEAD every (label, url) concurrently; results keep the input order"""
+        cache = self._load_cache()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(lambda target: self._check_one(target[0], target[1], cache.get(target[1])), targets))
+
+        for result in results:
+            if result['ok']:
+                cache[result['url']] = {
+                    'etag': result['etag'],
+                    'last_modified': result['last_modified'],
+                    'bytes': result['bytes']
+                }
+            else:
+                cache.pop(result['url'], None)
+        self._save_cache(cache)
+        return results
+
+    def summarize(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Status counts, total size and latency percentiles"""
+        latencies = [result['latency_ms'] for result in results if result['latency_ms'] is not None]
+        status_counts: Dict[str, int] = {}
+        for result in results:
+            key = str(result['status']) if result['status'] is not None else 'error'
+            status_counts[key] = status_counts.get(key, 0) + 1
+        return {
+            'checked': len(results),
+            'ok': sum(1 for result in results if result['ok']),
+            'not_modified': sum(1 for result in results if result['status'] == 304),
+            'status_counts': status_counts,
+            'total_bytes': sum(result['bytes'] or 0 for result in results if result['ok']),
+            'latency_ms': {
+                'p50': percentile(latencies, 0.50),
+                'p90': percentile(latencies, 0.90),
+                'p99': percentile(latencies, 0.99),
+                'max': max(latencies) if latencies else None
+            }
+        }
+
+    def _check_one(self, label: str, url: str, cached: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        headers = {}
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        result = {
+            'label': label,
+            'url': url,
+            'status': None,
+            'ok': False,
+            'bytes': None,
+            'etag': None,
+            'last_modified': None,
+            'latency_ms': None,
+            'error': None
+        }
+
+        started = time.monotonic()
+        try:
+            response = self.session.head(url, headers=headers, timeout=self.timeout, allow_redirects=True)
+        except requests.RequestException as e:
+            result['error'] = str(e)
+            return result
+        result['latency_ms'] = (time.monotonic() - started) * 1000
+        result['status'] = response.status_code
+
+        if response.status_code == 304 and cached:
+            result.update({
+                'ok': True,
+                'bytes': cached.get('bytes'),
+                'etag': response.headers.get('ETag', cached.get('etag')),
+                'last_modified': response.headers.get('Last-Modified', cached.get('last_modified'))
+            })
+        elif response.status_code == 200:
+            length = response.headers.get('Content-Length')
+            result.update({
+                'ok': True,
+                'bytes': int(length) if length else None,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified')
+            })
+        return result
+
+    def _load_cache(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.exists(self.cache_file):
+            return {}
+        try:
+            with open(self.cache_file, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self, cache: Dict[str, Dict[str, Any]]):
+        tmp_path = f"{self.cache_file}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(cache, f, indent=2)
+        os.replace(tmp_path, self.cache_file)
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Recipe Inspection Data Layer
+Fetches recipes with their ingredients and ordered steps in one embedded PostgREST query
+"""
+
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import quote
+
+from supabase_client import SupabaseClient
+from supabase_pagination import iter_rows
+
+# recipe_ingredients and preparation_steps are embedded through their recipe_id foreign keys
+EMBEDDED_SELECT = '*,recipe_ingredients(*,ingredients(name)),preparation_steps(*)'
+DEFAULT_PAGE_SIZE = 100
+
+
+class RecipeInspector:
+    def __init__(self, client: SupabaseClient, page_size: int = DEFAULT_PAGE_SIZE):
+        self.client = client
+        self.page_size = page_size
+
+    def iter_recipes(self, filters: str = '') -> Iterator[Dict[str, Any]]:
+        """Yield every matching recipe with recipe_ingredients and preparation_steps attached
+
+        filters is a PostgREST query fragment such as 'name=eq.Salmon%20Toast'.
+        """
+        order_steps = 'preparation_steps.order=step_number.asc'
+        return iter_rows(self.client, 'recipes', EMBEDDED_SELECT,
+                         f'{order_steps}&{filters}' if filters else order_steps, page_size=self.page_size)
+
+    def get_all_recipes(self) -> List[Dict[str, Any]]:
+        return list(self.iter_recipes())
+
+    def get_recipe(self, recipe_id: Optional[str] = None, name: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """One recipe by id or exact name, with everything embedded"""
+        if recipe_id:
+            filters = f'id=eq.{recipe_id}'
+        elif name:
+            filters = f'name=eq.{quote(name)}'
+        else:
+            raise ValueError("Pass a recipe_id or a name")
+        return next(self.iter_recipes(filters), None)
+
+
+def ingredient_name(recipe_ingredient: Dict[str, Any]) -> Optional[str]:
+    """Name of the embedded ingredient, if the join found one"""
+    ingredient = recipe_ingredient.get('ingredients')
+    return ingredient.get('name') if ingredient else None
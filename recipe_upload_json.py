@@ -22,10 +22,10 @@ class SimpleRecipeUploader:
         }
     
     def check_recipe_exists(self, recipe_name: str) -> bool:
-        """Check if a recipe with the given name already exists"""
+        """Check if a live recipe with the given name already exists (a tombstoned one can be re-uploaded)"""
         try:
             response = requests.get(
-                f'{self.supabase_url}/rest/v1/recipes?name=eq.{recipe_name}',
+                f'{self.supabase_url}/rest/v1/recipes?name=eq.{recipe_name}&deleted_at=is.null',
                 headers=self.headers
             )
             
@@ -37,8 +37,7 @@ class SupabaseRecipeUploader:
                 'calories': recipe_data['calories'],
                 'image_url': recipe_data.get('image_url'),
                 'tags': recipe_data.get('tags', []),
-                'created_at': datetime.now().isoformat(),
-                'updated_at': datetime.now().isoformat()
+                'created_at': datetime.now().isoformat()
             }
             
             # Upload recipe
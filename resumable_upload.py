@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Resumable Image Upload (TUS)
+Chunked uploads to Supabase Storage that resume from the last acknowledged offset
+"""
+
+import base64
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from typing import BinaryIO, Dict, Optional
+from urllib.parse import urljoin
+
+import requests
+
+from supabase_client import SupabaseClient
+
+TUS_VERSION = '1.0.0'
+
+# Supabase Storage currently expects 6 MB chunks for resumable uploads
+DEFAULT_CHUNK_SIZE = 6 * 1024 * 1024
+DEFAULT_STATE_FILE = '.tus_uploads.json'
+
+
+class ResumableImageUploader:
+    def __init__(self, client: SupabaseClient, bucket: str = 'recipe-images',
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, state_file: str = DEFAULT_STATE_FILE,
+                 max_retries: int = 5, endpoint: Optional[str] = None):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        self.client = client
+        self.bucket = bucket
+        self.chunk_size = chunk_size
+        self.state_file = state_file
+        self.max_retries = max_retries
+        self.endpoint = endpoint or client.url('/storage/v1/upload/resumable')
+        self._state_lock = threading.Lock()
+
+    def upload_file(self, path: str, object_name: str, content_type: str = 'image/png', upsert: bool = True) -> bool:
+        """Upload a local file, resuming a previous interrupted transfer if one exists"""
+        with open(path, 'rb') as f:
+            return self._upload(f, os.path.getsize(path), object_name, content_type, upsert)
+
+    def upload_bytes(self, data: bytes, object_name: str, content_type: str = 'image/png', upsert: bool = True) -> bool:
+        """Upload in-memory image data through the resumable endpoint"""
+        return self._upload(io.BytesIO(data), len(data), object_name, content_type, upsert)
+
+    def _upload(self, stream: BinaryIO, size: int, object_name: str, content_type: str, upsert: bool) -> bool:
+        fingerprint = self._fingerprint(stream, size, object_name)
+
+        upload_url = self._load_state().get(fingerprint)
+        offset = self._fetch_offset(upload_url) if upload_url else None
+
+        if offset is None:
+            upload_url = self._create_upload(size, object_name, content_type, upsert)
+            if not upload_url:
+                return False
+            self._remember(fingerprint, upload_url)
+            offset = 0
+        else:
+            print(f"🔁 Resuming {object_name} at {offset}/{size} bytes")
+
+        attempts = 0
+        while offset < size:
+            stream.seek(offset)
+            chunk = stream.read(self.chunk_size)
+
+            try:
+                response = self.client.patch(
+                    upload_url,
+                    headers={
+                        'Tus-Resumable': TUS_VERSION,
+                        'Upload-Offset': str(offset),
+                        'Content-Type': 'application/offset+octet-stream',
+                        'Prefer': None
+                    },
+                    data=chunk
+                )
+                if response.status_code == 204:
+                    offset = int(response.headers['Upload-Offset'])
+                    attempts = 0
+                    print(f"   📦 {object_name}: {offset}/{size} bytes")
+                    continue
+                error = f"{response.status_code} - {response.text}"
+            except requests.RequestException as e:
+                error = str(e)
+
+            attempts += 1
+            if attempts > self.max_retries:
+                print(f"❌ Giving up on {object_name} at {offset}/{size} bytes: {error}")
+                print("   Run again to resume from the last acknowledged offset")
+                return False
+
+            print(f"⚠️  Chunk for {object_name} failed ({error}), retry {attempts}/{self.max_retries}")
+            self.client.metrics.record_retry('PATCH', upload_url)
+            time.sleep(min(2 ** (attempts - 1), 30))
+
+            server_offset = self._fetch_offset(upload_url)
+            if server_offset is None:
+                # The server expired the upload; start a fresh one
+                upload_url = self._create_upload(size, object_name, content_type, upsert)
+                if not upload_url:
+                    return False
+                self._remember(fingerprint, upload_url)
+                offset = 0
+            else:
+                offset = server_offset
+
+        self._forget(fingerprint)
+        print(f"✅ Successfully uploaded: {object_name}")
+        return True
+
+    def _create_upload(self, size: int, object_name: str, content_type: str, upsert: bool) -> Optional[str]:
+        """Create a TUS upload and return its URL"""
+        metadata = {
+            'bucketName': self.bucket,
+            'objectName': object_name,
+            'contentType': content_type,
+            'cacheControl': '3600'
+        }
+        encoded_metadata = ','.join(
+            f"{key} {base64.b64encode(value.encode('utf-8')).decode('ascii')}"
+            for key, value in metadata.items()
+        )
+
+        try:
+            response = self.client.post(
+                self.endpoint,
+                headers={
+                    'Tus-Resumable': TUS_VERSION,
+                    'Upload-Length': str(size),
+                    'Upload-Metadata': encoded_metadata,
+                    'x-upsert': 'true' if upsert else 'false',
+                    'Content-Type': None,
+                    'Prefer': None
+                }
+            )
+        except requests.RequestException as e:
+            print(f"❌ Error creating upload for {object_name}: {str(e)}")
+            return None
+
+        if response.status_code != 201 or 'Location' not in response.headers:
+            print(f"❌ Failed to create upload for {object_name}: {response.status_code} - {response.text}")
+            return None
+
+        return urljoin(self.endpoint, response.headers['Location'])
+
+    def _fetch_offset(self, upload_url: str) -> Optional[int]:
+        """Ask the server how many bytes it has; None when the upload is gone"""
+        try:
+            response = self.client.head(upload_url, headers={'Tus-Resumable': TUS_VERSION, 'Prefer': None})
+        except requests.RequestException:
+            return None
+        if response.status_code not in [200, 204] or 'Upload-Offset' not in response.headers:
+            return None
+        return int(response.headers['Upload-Offset'])
+
+    def _fingerprint(self, stream: BinaryIO, size: int, object_name: str) -> str:
+        digest = hashlib.sha256()
+        stream.seek(0)
+        for block in iter(lambda: stream.read(1024 * 1024), b''):
+            digest.update(block)
+        return f"{self.bucket}/{object_name}:{size}:{digest.hexdigest()}"
+
+    def _load_state(self) -> Dict[str, str]:
+        with self._state_lock:
+            return self._read_state()
+
+    def _read_state(self) -> Dict[str, str]:
+        if not os.path.exists(self.state_file):
+            return {}
+        try:
+            with open(self.state_file, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_state(self, state: Dict[str, str]):
+        tmp_path = f"{self.state_file}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.state_file)
+
+    def _remember(self, fingerprint: str, upload_url: str):
+        with self._state_lock:
+            state = self._read_state()
+            state[fingerprint] = upload_url
+            self._write_state(state)
+
+    def _forget(self, fingerprint: str):
+        with self._state_lock:
+            state = self._read_state()
+            if state.pop(fingerprint, None) is not None:
+                self._write_state(state)
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Shared Supabase HTTP Client
+Thread-safe requests wrapper used by the admin and image scripts
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import requests
+
+from http_recording import HttpRecorder, HttpReplayer, body_size
+from supabase_metrics import RequestMetrics
+
+# Keyword arguments that shape the request body; everything else is a transport option
+BODY_ARGUMENTS = ['params', 'data', 'json', 'files']
+
+
+class SupabaseClient:
+    def __init__(self, supabase_url: str, supabase_key: str, timeout: float = 30,
+                 metrics: Optional[RequestMetrics] = None, recorder: Optional[HttpRecorder] = None,
+                 replayer: Optional[HttpReplayer] = None):
+        self.supabase_url = supabase_url.rstrip('/')
+        self.supabase_key = supabase_key
+        self.timeout = timeout
+        self.metrics = metrics or RequestMetrics()
+        # recorder appends every exchange to a JSONL file; replayer answers from one without any network
+        self.recorder = recorder
+        self.replayer = replayer
+        self.headers = {
+            'apikey': supabase_key,
+            'Authorization': f'Bearer {supabase_key}',
+            'Content-Type': 'application/json',
+            'Prefer': 'return=minimal'
+        }
+        self._local = threading.local()
+
+    @property
+    def session(self) -> requests.Session:
+        """One keep-alive session per thread so concurrent workers reuse connections"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            self._local.session = session
+        return session
+
+    def url(self, path: str) -> str:
+        """Resolve a project-relative path such as /rest/v1/recipes"""
+        if path.startswith('http://') or path.startswith('https://'):
+            return path
+        return f'{self.supabase_url}{path}'
+
+    def request(self, method: str, path: str, headers: Optional[Dict[str, str]] = None, **kwargs: Any) -> requests.Response:
+        """Send a request with the project auth headers merged with any overrides
+
+        Absolute URLs outside the project (say, an image source) get no project
+        headers, so the key never leaves for a third-party host.
+        """
+        merged_headers = dict(self.headers) if self._is_project_url(self.url(path)) else {}
+        if headers:
+            merged_headers.update(headers)
+        kwargs.setdefault('timeout', self.timeout)
+        stream = kwargs.pop('stream', False)
+        body = {name: kwargs.pop(name) for name in BODY_ARGUMENTS if name in kwargs}
+        prepared = self.session.prepare_request(requests.Request(method, self.url(path), headers=merged_headers, **body))
+
+        opened_before = self._connections_opened()
+        started = time.monotonic()
+        try:
+            if self.replayer:
+                response = self.replayer.respond(prepared)
+            else:
+                settings = self.session.merge_environment_settings(
+                    prepared.url, kwargs.pop('proxies', {}), stream, kwargs.pop('verify', None), kwargs.pop('cert', None)
+                )
+                response = self.session.send(prepared, **settings, **kwargs)
+        except requests.RequestException:
+            self.metrics.record_request(method, path, time.monotonic() - started)
+            raise
+        elapsed = time.monotonic() - started
+
+        if self.recorder:
+            self.recorder.record(prepared, response, elapsed)
+
+        opened_after = self._connections_opened()
+        reused = None if self.replayer or opened_before is None or opened_after is None else opened_after == opened_before
+        self.metrics.record_request(
+            method, path, elapsed, response.status_code,
+            bytes_sent=self._body_size(prepared.body),
+            bytes_received=self._received_size(response, stream),
+            reused=reused
+        )
+        return response
+
+    def _connections_opened(self) -> Optional[int]:
+        """Connections this thread's session has opened so far; unchanged across a request means it reused one"""
+        try:
+            opened = 0
+            for adapter in self.session.adapters.values():
+                pools = adapter.poolmanager.pools
+                opened += sum(pools[key].num_connections for key in pools.keys())
+            return opened
+        except (AttributeError, KeyError):
+            return None
+
+    def _is_project_url(self, url: str) -> bool:
+        return url == self.supabase_url or url.startswith(f'{self.supabase_url}/')
+
+    def _body_size(self, body: Any) -> int:
+        # Read after sending, so a streamed relay has counted everything it forwarded
+        return body_size(body) or 0
+
+    def _received_size(self, response: requests.Response, stream: bool) -> int:
+        # Streaming callers read the body themselves; trust the header instead of consuming it
+        if stream:
+            return int(response.headers.get('Content-Length') or 0)
+        return len(response.content)
+
+    def get(self, path: str, **kwargs: Any) -> requests.Response:
+        return self.request('GET', path, **kwargs)
+
+    def head(self, path: str, **kwargs: Any) -> requests.Response:
+        return self.request('HEAD', path, **kwargs)
+
+    def post(self, path: str, **kwargs: Any) -> requests.Response:
+        return self.request('POST', path, **kwargs)
+
+    def patch(self, path: str, **kwargs: Any) -> requests.Response:
+        return self.request('PATCH', path, **kwargs)
+
+    def delete(self, path: str, **kwargs: Any) -> requests.Response:
+        return self.request('DELETE', path, **kwargs)
+
+    def storage_object_path(self, bucket: str, name: str) -> str:
+        """Authenticated object endpoint used for uploads"""
+        return f'/storage/v1/object/{bucket}/{name}'
+
+    def public_object_url(self, bucket: str, name: str) -> str:
+        """Public URL stored in recipes.image_url"""
+        return f'{self.supabase_url}/storage/v1/object/public/{bucket}/{name}'
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Supabase Request Metrics
+Latency histograms, byte counts, statuses, retries and connection reuse per
+endpoint, plus phase spans, exported as JSON or Prometheus text at the end of a run
+"""
+
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+DEFAULT_METRICS_FILE = 'supabase_metrics.json'
+
+# Upper bounds in seconds, Prometheus-style; the last bucket is +Inf
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Storage path segments that name an operation, so the bucket comes one segment later
+STORAGE_OPERATIONS = ['list', 'public', 'sign', 'info']
+
+# First path segment of the project's own APIs; any other absolute URL is a third-party host
+API_ROOTS = ['rest', 'storage', 'auth', 'functions', 'realtime']
+
+
+def endpoint_label(path: str) -> str:
+    """Low-cardinality label for a request path: no query string, no object names
+
+    /rest/v1/recipes?id=eq.1              -> /rest/v1/recipes
+    /storage/v1/object/recipe-images/a    -> /storage/v1/object/recipe-images/*
+    /storage/v1/object/list/recipe-images -> /storage/v1/object/list/recipe-images
+    /storage/v1/upload/resumable/<id>     -> /storage/v1/upload/resumable/*
+    https://images.example.com/a/b.jpg    -> https://images.example.com/*
+    """
+    parts = urlsplit(path)
+    segments = parts.path.strip('/').split('/')
+    if parts.netloc and segments[0] not in API_ROOTS:
+        return f'{parts.scheme}://{parts.netloc}/*'
+    if segments[0] == 'storage':
+        keep = 5 if len(segments) > 3 and segments[3] in STORAGE_OPERATIONS else 4
+        if len(segments) > keep:
+            return '/' + '/'.join(segments[:keep]) + '/*'
+    return '/' + '/'.join(segments)
+
+
+def _new_histogram() -> Dict[str, Any]:
+    return {'count': 0, 'sum': 0.0, 'max': 0.0, 'buckets': [0] * (len(LATENCY_BUCKETS) + 1)}
+
+
+def _observe(histogram: Dict[str, Any], seconds: float):
+    histogram['count'] += 1
+    histogram['sum'] += seconds
+    histogram['max'] = max(histogram['max'], seconds)
+    for i, bound in enumerate(LATENCY_BUCKETS):
+        if seconds <= bound:
+            histogram['buckets'][i] += 1
+            return
+    histogram['buckets'][-1] += 1
+
+
+def _quantile(histogram: Dict[str, Any], q: float) -> Optional[float]:
+    """Upper bound of the bucket holding the q-th observation"""
+    if not histogram['count']:
+        return None
+    rank = q * histogram['count']
+    seen = 0
+    for i, count in enumerate(histogram['buckets']):
+        seen += count
+        if seen >= rank:
+            return LATENCY_BUCKETS[i] if i < len(LATENCY_BUCKETS) else histogram['max']
+    return histogram['max']
+
+
+class RequestMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.endpoints: Dict[tuple, Dict[str, Any]] = {}
+        self.phases: Dict[str, Dict[str, Any]] = {}
+
+    def _endpoint(self, method: str, path: str) -> Dict[str, Any]:
+        key = (method.upper(), endpoint_label(path))
+        stats = self.endpoints.get(key)
+        if stats is None:
+            stats = {
+                'latency': _new_histogram(),
+                'bytes_sent': 0,
+                'bytes_received': 0,
+                'statuses': defaultdict(int),
+                'errors': 0,
+                'retries': 0,
+                'new_connections': 0,
+                'reused_connections': 0
+            }
+            self.endpoints[key] = stats
+        return stats
+
+    def record_request(self, method: str, path: str, seconds: float, status: Optional[int] = None,
+                       bytes_sent: int = 0, bytes_received: int = 0, reused: Optional[bool] = None):
+        """One finished request; status None means it raised before a response arrived"""
+        with self._lock:
+            stats = self._endpoint(method, path)
+            _observe(stats['latency'], seconds)
+            stats['bytes_sent'] += bytes_sent
+            stats['bytes_received'] += bytes_received
+            if status is None:
+                stats['errors'] += 1
+            else:
+                stats['statuses'][str(status)] += 1
+            if reused is True:
+                stats['reused_connections'] += 1
+            elif reused is False:
+                stats['new_connections'] += 1
+
+    def record_retry(self, method: str, path: str):
+        with self._lock:
+            self._endpoint(method, path)['retries'] += 1
+
+    @contextmanager
+    def span(self, phase: str) -> Iterator[None]:
+        """Time a phase such as 'insert_steps'; nested and concurrent spans are fine"""
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - started
+            with self._lock:
+                _observe(self.phases.setdefault(phase, _new_histogram()), elapsed)
+
+    # Export
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            endpoints = []
+            for (method, endpoint), stats in sorted(self.endpoints.items()):
+                latency = stats['latency']
+                endpoints.append({
+                    'method': method,
+                    'endpoint': endpoint,
+                    'requests': latency['count'],
+                    'total_seconds': round(latency['sum'], 6),
+                    'p50_seconds': _quantile(latency, 0.5),
+                    'p95_seconds': _quantile(latency, 0.95),
+                    'max_seconds': round(latency['max'], 6),
+                    'latency_buckets': dict(zip([str(b) for b in LATENCY_BUCKETS] + ['+Inf'], latency['buckets'])),
+                    'bytes_sent': stats['bytes_sent'],
+                    'bytes_received': stats['bytes_received'],
+                    'statuses': dict(stats['statuses']),
+                    'errors': stats['errors'],
+                    'retries': stats['retries'],
+                    'new_connections': stats['new_connections'],
+                    'reused_connections': stats['reused_connections']
+                })
+            phases = {
+                phase: {'count': h['count'], 'total_seconds': round(h['sum'], 6), 'max_seconds': round(h['max'], 6)}
+                for phase, h in sorted(self.phases.items())
+            }
+        return {'started_at': self.started, 'wall_seconds': round(time.time() - self.started, 6),
+                'endpoints': endpoints, 'phases': phases}
+
+    def to_prometheus(self) -> str:
+        """Text exposition format, suitable for node_exporter's textfile collector"""
+        lines = ['# TYPE supabase_request_duration_seconds histogram']
+        with self._lock:
+            items = sorted(self.endpoints.items())
+            for (method, endpoint), stats in items:
+                labels = f'method="{method}",endpoint="{endpoint}"'
+                cumulative = 0
+                for bound, count in zip([str(b) for b in LATENCY_BUCKETS] + ['+Inf'], stats['latency']['buckets']):
+                    cumulative += count
+                    lines.append(f'supabase_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'supabase_request_duration_seconds_sum{{{labels}}} {stats["latency"]["sum"]:.6f}')
+                lines.append(f'supabase_request_duration_seconds_count{{{labels}}} {stats["latency"]["count"]}')
+
+            counters = [
+                ('supabase_request_bytes_sent_total', 'bytes_sent'),
+                ('supabase_request_bytes_received_total', 'bytes_received'),
+                ('supabase_request_errors_total', 'errors'),
+                ('supabase_request_retries_total', 'retries'),
+                ('supabase_connections_opened_total', 'new_connections'),
+                ('supabase_connections_reused_total', 'reused_connections')
+            ]
+            for metric, field in counters:
+                lines.append(f'# TYPE {metric} counter')
+                for (method, endpoint), stats in items:
+                    lines.append(f'{metric}{{method="{method}",endpoint="{endpoint}"}} {stats[field]}')
+
+            lines.append('# TYPE supabase_responses_total counter')
+            for (method, endpoint), stats in items:
+                for status, count in sorted(stats['statuses'].items()):
+                    lines.append(f'supabase_responses_total{{method="{method}",endpoint="{endpoint}",status="{status}"}} {count}')
+
+            lines.append('# TYPE supabase_phase_seconds summary')
+            for phase, histogram in sorted(self.phases.items()):
+                lines.append(f'supabase_phase_seconds_sum{{phase="{phase}"}} {histogram["sum"]:.6f}')
+                lines.append(f'supabase_phase_seconds_count{{phase="{phase}"}} {histogram["count"]}')
+        return '\n'.join(lines) + '\n'
+
+    def export(self, path: str = DEFAULT_METRICS_FILE) -> str:
+        """Write Prometheus text for *.prom paths, JSON otherwise"""
+        if path.endswith('.prom'):
+            content = self.to_prometheus()
+        else:
+            content = json.dumps(self.summary(), indent=2)
+        temp_path = f'{path}.tmp'
+        with open(temp_path, 'w') as f:
+            f.write(content)
+        os.replace(temp_path, path)
+        return path
+
+    def print_summary(self):
+        summary = self.summary()
+        if not summary['endpoints']:
+            return
+        print("\n⏱️  Request timings:")
+        for stats in summary['endpoints']:
+            details = [f"{stats['requests']} requests", f"{stats['total_seconds']:.2f}s total"]
+            if stats['p95_seconds'] is not None:
+                details.append(f"p95 ≤ {stats['p95_seconds']}s")
+            details += [f"{stats['bytes_sent']}B sent", f"{stats['bytes_received']}B received",
+                        f"{stats['new_connections']} new / {stats['reused_connections']} reused connections"]
+            if stats['retries']:
+                details.append(f"{stats['retries']} retries")
+            if stats['errors']:
+                details.append(f"{stats['errors']} errors")
+            print(f"   {stats['method']:6} {stats['endpoint']}: {', '.join(details)}")
+        for phase, stats in summary['phases'].items():
+            print(f"   ⏳ {phase}: {stats['count']}× in {stats['total_seconds']:.2f}s")
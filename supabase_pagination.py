@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Keyset Pagination for PostgREST Tables
+Streams whole tables page by page without hitting the server's max-rows cap
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import quote
+
+from supabase_client import SupabaseClient
+
+# PostgREST's default max-rows; a lower server cap only means shorter pages, not lost rows
+DEFAULT_PAGE_SIZE = 1000
+
+
+def _top_level_columns(select: str) -> List[str]:
+    """Split a select list on commas that are not inside an embedded resource"""
+    columns, depth, current = [], 0, ''
+    for character in select:
+        if character == ',' and depth == 0:
+            columns.append(current.strip())
+            current = ''
+            continue
+        depth += {'(': 1, ')': -1}.get(character, 0)
+        current += character
+    columns.append(current.strip())
+    return columns
+
+
+class KeysetReader:
+    """Reads a table ordered by a unique key, asking for rows after the last key seen
+
+    Unlike offset paging this stays correct while rows are inserted or deleted,
+    and each page costs the same no matter how deep into the table it is. The
+    next page is requested as soon as the current one arrives, so callers
+    process one page while the next is in flight; at most two pages are held
+    in memory.
+
+    Paging ends on an empty page, not a short one: a project whose max-rows
+    is below page_size returns short pages long before the end of the table.
+    That costs one extra request per read.
+    """
+
+    def __init__(self, client: SupabaseClient, table: str, select: str = '*', filters: str = '',
+                 key: str = 'id', page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True):
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        columns = _top_level_columns(select)
+        if '*' not in columns and key not in columns:
+            select = f'{select},{key}'
+        self.client = client
+        self.table = table
+        self.select = select
+        self.filters = filters
+        self.key = key
+        self.page_size = page_size
+        self.prefetch = prefetch
+        self.pages_fetched = 0
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        if not self.prefetch:
+            after = None
+            while True:
+                page = self._fetch_page(after)
+                if not page:
+                    return
+                yield from page
+                after = page[-1][self.key]
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending = executor.submit(self._fetch_page, None)
+            while pending is not None:
+                page = pending.result()
+                pending = None
+                if page:
+                    pending = executor.submit(self._fetch_page, page[-1][self.key])
+                yield from page
+
+    def _fetch_page(self, after: Optional[Any]) -> List[Dict[str, Any]]:
+        query = f'select={self.select}&order={self.key}.asc&limit={self.page_size}'
+        if after is not None:
+            query += f'&{self.key}=gt.{quote(str(after))}'
+        if self.filters:
+            query += f'&{self.filters}'
+        response = self.client.get(f'/rest/v1/{self.table}?{query}')
+        if response.status_code != 200:
+            raise RuntimeError(f"Failed to fetch {self.table}: {response.status_code} - {response.text}")
+        self.pages_fetched += 1
+        return response.json()
+
+
+def iter_rows(client: SupabaseClient, table: str, select: str = '*', filters: str = '',
+              key: str = 'id', page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True) -> Iterator[Dict[str, Any]]:
+    """Yield every row of table (matching filters), one keyset page at a time"""
+    return iter(KeysetReader(client, table, select, filters, key, page_size, prefetch))
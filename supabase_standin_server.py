@@ -0,0 +1,528 @@
+#!/usr/bin/env python3
+"""
+Local Supabase Stand-in Server
+In-memory PostgREST and Storage subset used by the admin scripts, with
+injectable latency and errors for benchmarks
+"""
+
+import hashlib
+import json
+import random
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from fnmatch import fnmatchcase
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+from supabase_metrics import endpoint_label
+from tus_standin_server import RESUMABLE_PATH, TusRequestHandler, TusStandinServer
+
+# Constraints from create_tables.sql that change how writes behave
+SCHEMA = {
+    'recipes': {'unique': [], 'foreign_keys': {}},
+    'ingredients': {'unique': [('name',)], 'foreign_keys': {}},
+    'recipe_ingredients': {
+        'unique': [('recipe_id', 'ingredient_id')],
+        'foreign_keys': {'recipe_id': 'recipes', 'ingredient_id': 'ingredients'}
+    },
+    'preparation_steps': {
+        'unique': [('recipe_id', 'step_number')],
+        'foreign_keys': {'recipe_id': 'recipes'}
+    }
+}
+
+# Columns with hash indexes, so eq/in filters do not scan whole tables
+INDEXED_COLUMNS = ['id', 'name', 'recipe_id', 'ingredient_id']
+
+QUERY_PARAMETERS = ['select', 'order', 'limit', 'offset', 'on_conflict', 'columns']
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _coerce(value: Any, argument: str) -> Tuple[Any, Any]:
+    """Compare a stored value with a filter argument the way Postgres would for the column's type"""
+    if isinstance(value, bool):
+        return value, argument.lower() == 'true'
+    if isinstance(value, (int, float)):
+        try:
+            return value, float(argument)
+        except ValueError:
+            return str(value), argument
+    return value, argument
+
+
+def _matches(value: Any, operator: str, argument: str) -> bool:
+    if operator == 'not':
+        operator, _, argument = argument.partition('.')
+        # NOT of a comparison with NULL is still NULL, so only is.* can match a null
+        return (operator == 'is' or value is not None) and not _matches(value, operator, argument)
+    if operator == 'is':
+        return {'null': value is None, 'true': value is True, 'false': value is False}.get(argument.lower(), False)
+    if operator == 'in':
+        options = [option.strip('"') for option in argument.strip('()').split(',')] if argument.strip('()') else []
+        return value is not None and any(_coerce(value, option)[0] == _coerce(value, option)[1] for option in options)
+    if value is None:
+        return False
+    if operator in ['like', 'ilike']:
+        pattern = argument.replace('%', '*')
+        return fnmatchcase(str(value).lower(), pattern.lower()) if operator == 'ilike' else fnmatchcase(str(value), pattern)
+    left, right = _coerce(value, argument)
+    comparisons = {
+        'eq': lambda: left == right,
+        'neq': lambda: left != right,
+        'gt': lambda: left > right,
+        'gte': lambda: left >= right,
+        'lt': lambda: left < right,
+        'lte': lambda: left <= right
+    }
+    if operator not in comparisons:
+        raise ValueError(f"Operator {operator} is not supported by the stand-in")
+    return comparisons[operator]()
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, code: str, message: str):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+
+
+class Table:
+    """Rows by id plus hash indexes on the columns scripts filter by"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.rows: Dict[str, Dict[str, Any]] = {}
+        self.indexes: Dict[str, Dict[Any, set]] = {column: defaultdict(set) for column in INDEXED_COLUMNS}
+
+    def add(self, row: Dict[str, Any]):
+        self.rows[row['id']] = row
+        for column, index in self.indexes.items():
+            if row.get(column) is not None:
+                index[row[column]].add(row['id'])
+
+    def remove(self, row_id: str) -> Optional[Dict[str, Any]]:
+        row = self.rows.pop(row_id, None)
+        if row is not None:
+            for column, index in self.indexes.items():
+                if row.get(column) is not None:
+                    index[row[column]].discard(row_id)
+        return row
+
+    def candidates(self, filters: List[Tuple[str, str, str]]) -> List[Dict[str, Any]]:
+        """Rows matching every filter, starting from an index when one applies"""
+        ids = None
+        for column, operator, argument in filters:
+            if column in self.indexes and operator in ['eq', 'in']:
+                values = [argument] if operator == 'eq' else [v.strip('"') for v in argument.strip('()').split(',')]
+                found = set().union(*(self.indexes[column].get(value, set()) for value in values))
+                ids = found if ids is None else ids & found
+        rows = self.rows.values() if ids is None else [self.rows[row_id] for row_id in ids]
+        return [row for row in rows if all(_matches(row.get(c), o, a) for c, o, a in filters)]
+
+
+class SupabaseStandinServer(TusStandinServer):
+    """PostgREST tables, Storage objects and TUS uploads in one process
+
+    latency adds a fixed delay (plus up to jitter) to every request and
+    error_rate answers that fraction of requests with a 503, both seeded so
+    runs are repeatable. GET /__standin/stats reports requests per endpoint.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, seed: int = 0, tables: Optional[Dict[str, List[Dict[str, Any]]]] = None):
+        super().__init__(host, port)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.tables = {name: Table(name) for name in SCHEMA}
+        self.object_metadata: Dict[str, Dict[str, Any]] = {}
+        self.request_counts: Dict[str, int] = defaultdict(int)
+        self.injected_errors = 0
+        self.rpc: Dict[str, Callable[['SupabaseStandinServer', Any], Any]] = {
+            'update_recipe_image_urls': _update_recipe_image_urls,
+            'recipe_delete_rules': _recipe_delete_rules,
+            'orphan_ingredients': _orphan_ingredients
+        }
+        for name, rows in (tables or {}).items():
+            self.seed(name, rows)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def seed(self, table: str, rows: List[Dict[str, Any]]):
+        """Load rows directly, skipping constraint checks"""
+        with self.lock:
+            for row in rows:
+                self.tables[table].add(dict(row, id=row.get('id') or str(uuid.uuid4())))
+
+    def put_object(self, bucket: str, name: str, data: bytes, content_type: str = 'application/octet-stream'):
+        with self.lock:
+            self._store_object(f'{bucket}/{name}', data, content_type)
+
+    def _store_object(self, key: str, data: bytes, content_type: str):
+        now = _now()
+        self.objects[key] = data
+        self.object_metadata[key] = {
+            'id': str(uuid.uuid4()),
+            'created_at': self.object_metadata.get(key, {}).get('created_at', now),
+            'updated_at': now,
+            'metadata': {'size': len(data), 'mimetype': content_type, 'eTag': f'"{hashlib.md5(data).hexdigest()}"'}
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                'requests': dict(self.request_counts),
+                'total_requests': sum(self.request_counts.values()),
+                'injected_errors': self.injected_errors,
+                'rows': {name: len(table.rows) for name, table in self.tables.items()},
+                'objects': len(self.objects)
+            }
+
+
+def _update_recipe_image_urls(server: SupabaseStandinServer, body: Dict[str, Any]) -> None:
+    """Mirror of the SQL function in add_image_sync_functions.sql"""
+    recipes = server.tables['recipes']
+    for update in body.get('updates', []):
+        row = recipes.rows.get(update['id'])
+        if row is not None:
+            row.update(image_url=update['image_url'], updated_at=_now())
+
+
+def _recipe_delete_rules(server: SupabaseStandinServer, body: Dict[str, Any]) -> List[Dict[str, str]]:
+    """Mirror of the SQL function in add_bulk_delete_functions.sql; every stand-in foreign key cascades"""
+    return [
+        {'table_name': table, 'column_name': column, 'delete_rule': 'CASCADE'}
+        for table, schema in sorted(SCHEMA.items())
+        for column, parent in sorted(schema['foreign_keys'].items()) if parent == 'recipes'
+    ]
+
+
+def _orphan_ingredients(server: SupabaseStandinServer, body: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Mirror of the SQL function in add_ingredient_gc_functions.sql"""
+    referenced = server.tables['recipe_ingredients'].indexes['ingredient_id']
+    return sorted(
+        ({'id': row['id'], 'name': row['name'], 'created_at': row.get('created_at')}
+         for row in server.tables['ingredients'].rows.values() if not referenced.get(row['id'])),
+        key=lambda row: row['name']
+    )
+
+
+class SupabaseRequestHandler(TusRequestHandler):
+    server: SupabaseStandinServer
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without this keep-alive clients stall on delayed ACKs
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_HEAD(self):
+        self._dispatch('HEAD')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_PUT(self):
+        self._dispatch('PUT')
+
+    def do_PATCH(self):
+        self._dispatch('PATCH')
+
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+
+    def _dispatch(self, method: str):
+        path = urlsplit(self.path).path
+        if path == '/__standin/stats':
+            self._send_json(200, self.server.stats())
+            return
+
+        with self.server.lock:
+            self.server.request_counts[f'{method} {endpoint_label(path)}'] += 1
+            delay = self.server.latency + self.server.random.uniform(0, self.server.jitter)
+            fail = self.server.random.random() < self.server.error_rate
+            if fail:
+                self.server.injected_errors += 1
+        if delay:
+            time.sleep(delay)
+
+        if fail:
+            self.rfile.read(int(self.headers.get('Content-Length') or 0))
+            self._send_json(503, {'message': 'Injected failure from the stand-in server'})
+            return
+        body = self._read_body()
+
+        try:
+            if path.startswith(RESUMABLE_PATH):
+                self._tus(method, body)
+            elif path.startswith('/rest/v1/rpc/'):
+                self._rpc(path[len('/rest/v1/rpc/'):], body)
+            elif path.startswith('/rest/v1/'):
+                self._rest(method, path[len('/rest/v1/'):], body)
+            elif path.startswith('/storage/v1/object/'):
+                self._storage(method, path[len('/storage/v1/object/'):], body)
+            else:
+                raise ApiError(404, 'PGRST000', f'No stand-in route for {path}')
+        except ApiError as e:
+            self._send_json(e.status, {'code': e.code, 'message': str(e)})
+        except ValueError as e:
+            self._send_json(400, {'code': 'PGRST100', 'message': str(e)})
+
+    # TUS uploads reuse the base handler; it reads the body itself
+
+    def _read_body(self) -> bytes:
+        if self.path.startswith(RESUMABLE_PATH):
+            return b''
+        if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            # Streamed uploads of unknown length, such as an image relay without Content-Length
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().split(b';')[0].strip() or b'0', 16)
+                if not size:
+                    while self.rfile.readline() not in (b'\r\n', b'\n', b''):
+                        pass
+                    return b''.join(chunks)
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+        return self.rfile.read(int(self.headers.get('Content-Length') or 0))
+
+    def _tus(self, method: str, body: bytes):
+        handler = {'POST': TusRequestHandler.do_POST, 'HEAD': TusRequestHandler.do_HEAD,
+                   'PATCH': TusRequestHandler.do_PATCH}.get(method)
+        if handler is None:
+            raise ApiError(405, 'PGRST000', f'{method} is not allowed on resumable uploads')
+        handler(self)
+
+    def _complete(self, upload_id: str):
+        upload = self.server.uploads[upload_id]
+        key = f"{upload['metadata'].get('bucketName', '')}/{upload['metadata'].get('objectName', upload_id)}"
+        self.server._store_object(key, bytes(upload['data']), upload['metadata'].get('contentType', 'application/octet-stream'))
+
+    # PostgREST
+
+    def _rest(self, method: str, table_name: str, body: bytes):
+        table = self.server.tables.get(table_name)
+        if table is None:
+            raise ApiError(404, '42P01', f'relation "public.{table_name}" does not exist')
+        params, filters = self._parse_query()
+        prefer = self.headers.get('Prefer', '')
+
+        if method in ['GET', 'HEAD']:
+            with self.server.lock:
+                rows = self._order(table.candidates(filters), params.get('order'))
+                total = len(rows)
+                offset = int(params.get('offset', 0))
+                limit = int(params['limit']) if 'limit' in params else None
+                rows = [self._select(row, params.get('select', '*'))
+                        for row in rows[offset:offset + limit if limit is not None else None]]
+            headers = {}
+            if 'count=' in prefer:
+                headers['Content-Range'] = f'{offset}-{offset + len(rows) - 1}/{total}' if rows else f'*/{total}'
+            self._send_json(200, rows, headers, head=method == 'HEAD')
+            return
+
+        with self.server.lock:
+            if method == 'POST':
+                payload = json.loads(body or b'[]')
+                rows = [self._insert(table, row, 'merge-duplicates' in prefer) for row in (payload if isinstance(payload, list) else [payload])]
+            elif method == 'PATCH':
+                changes = json.loads(body or b'{}')
+                rows = table.candidates(filters)
+                for row in rows:
+                    table.remove(row['id'])
+                    row.update(changes)
+                    table.add(row)
+            elif method == 'DELETE':
+                rows = [self._delete(table, row['id']) for row in table.candidates(filters)]
+            else:
+                raise ApiError(405, 'PGRST000', f'{method} is not allowed')
+            self._touch_recipes(table, rows)
+            rows = [self._select(row, params.get('select', '*')) for row in rows]
+
+        if 'return=representation' in prefer:
+            self._send_json(201 if method == 'POST' else 200, rows)
+        else:
+            self._send_json(201 if method == 'POST' else 204, None)
+
+    def _parse_query(self) -> Tuple[Dict[str, str], List[Tuple[str, str, str]]]:
+        params, filters = {}, []
+        for part in filter(None, urlsplit(self.path).query.split('&')):
+            key, _, value = part.partition('=')
+            key, value = unquote(key), unquote(value)
+            if key in QUERY_PARAMETERS:
+                params[key] = value
+                continue
+            operator, _, argument = value.partition('.')
+            if key in ['or', 'and']:
+                raise ValueError(f"Filter {key}={value} is not supported by the stand-in")
+            filters.append((key, operator, argument))
+        return params, filters
+
+    def _order(self, rows: List[Dict[str, Any]], order: Optional[str]) -> List[Dict[str, Any]]:
+        rows = sorted(rows, key=lambda row: row['id'])
+        for term in reversed((order or '').split(',') if order else []):
+            column, _, direction = term.partition('.')
+            present = [row for row in rows if row.get(column) is not None]
+            missing = [row for row in rows if row.get(column) is None]
+            rows = sorted(present, key=lambda row: row[column], reverse=direction.startswith('desc')) + missing
+        return rows
+
+    def _select(self, row: Dict[str, Any], select: str) -> Dict[str, Any]:
+        if '(' in select:
+            raise ValueError("Embedded resources are not supported by the stand-in")
+        columns = [column.strip() for column in select.split(',')]
+        if '*' in columns:
+            return dict(row)
+        return {column: row.get(column) for column in columns}
+
+    def _insert(self, table: Table, row: Dict[str, Any], merge: bool) -> Dict[str, Any]:
+        row = dict(row)
+        row.setdefault('id', str(uuid.uuid4()))
+        row.setdefault('created_at', _now())
+        if table.name == 'recipes':
+            row.setdefault('updated_at', row['created_at'])
+
+        existing = table.rows.get(row['id'])
+        if existing is not None:
+            if not merge:
+                raise ApiError(409, '23505', f'duplicate key value violates unique constraint "{table.name}_pkey"')
+            existing.update(row)
+            return existing
+
+        schema = SCHEMA[table.name]
+        for column, parent in schema['foreign_keys'].items():
+            if row.get(column) is not None and row[column] not in self.server.tables[parent].rows:
+                raise ApiError(409, '23503', f'insert or update on table "{table.name}" violates foreign key constraint on {column}')
+        for columns in schema['unique']:
+            first = table.candidates([(columns[0], 'eq', str(row.get(columns[0])))])
+            if any(all(other.get(column) == row.get(column) for column in columns) for other in first):
+                raise ApiError(409, '23505', f'duplicate key value violates unique constraint on {", ".join(columns)}')
+        table.add(row)
+        return row
+
+    def _touch_recipes(self, table: Table, rows: List[Dict[str, Any]]):
+        """Mirror of the triggers in add_catalog_mirror_triggers.sql: writing a recipe or any of
+        its child rows stamps the recipe's updated_at with the server's time"""
+        if table.name == 'recipes':
+            recipe_ids = {row['id'] for row in rows}
+        elif SCHEMA[table.name]['foreign_keys'].get('recipe_id') == 'recipes':
+            recipe_ids = {row.get('recipe_id') for row in rows}
+        else:
+            return
+        now = _now()
+        for recipe_id in recipe_ids:
+            recipe = self.server.tables['recipes'].rows.get(recipe_id)
+            if recipe is not None:
+                recipe['updated_at'] = now
+
+    def _delete(self, table: Table, row_id: str) -> Dict[str, Any]:
+        """Remove a row and, like ON DELETE CASCADE, every row referencing it"""
+        row = table.remove(row_id)
+        for child_name, schema in SCHEMA.items():
+            for column, parent in schema['foreign_keys'].items():
+                if parent == table.name:
+                    child = self.server.tables[child_name]
+                    for child_id in list(child.indexes[column].get(row_id, set())):
+                        self._delete(child, child_id)
+        return row
+
+    def _rpc(self, function: str, body: bytes):
+        handler = self.server.rpc.get(function)
+        if handler is None:
+            raise ApiError(404, 'PGRST202', f'Could not find the function public.{function}')
+        with self.server.lock:
+            result = handler(self.server, json.loads(body or b'{}'))
+        self._send_json(200 if result is not None else 204, result)
+
+    # Storage
+
+    def _storage(self, method: str, rest: str, body: bytes):
+        if rest.startswith('list/') and method == 'POST':
+            self._list_objects(rest[len('list/'):], json.loads(body or b'{}'))
+            return
+        if rest.startswith('public/'):
+            rest = rest[len('public/'):]
+        bucket, _, name = unquote(rest).partition('/')
+        key = f'{bucket}/{name}'
+
+        if method == 'DELETE' and not name:
+            removed = []
+            with self.server.lock:
+                for prefix in json.loads(body or b'{}').get('prefixes', []):
+                    if self.server.objects.pop(f'{bucket}/{prefix}', None) is not None:
+                        self.server.object_metadata.pop(f'{bucket}/{prefix}', None)
+                        removed.append({'name': prefix, 'bucket_id': bucket})
+            self._send_json(200, removed)
+        elif method in ['POST', 'PUT']:
+            with self.server.lock:
+                if key in self.server.objects and method == 'POST' and self.headers.get('x-upsert') != 'true':
+                    raise ApiError(400, 'Duplicate', 'The resource already exists')
+                self.server._store_object(key, body, self.headers.get('Content-Type', 'application/octet-stream'))
+            self._send_json(200, {'Key': key})
+        elif method in ['GET', 'HEAD']:
+            with self.server.lock:
+                data = self.server.objects.get(key)
+                if data is None:
+                    raise ApiError(404, 'not_found', 'Object not found')
+                metadata = self.server.object_metadata[key]['metadata']
+            self._send_bytes(200, data, metadata['mimetype'], {'ETag': metadata['eTag']}, head=method == 'HEAD')
+        else:
+            raise ApiError(405, 'PGRST000', f'{method} is not allowed on storage objects')
+
+    def _list_objects(self, bucket: str, options: Dict[str, Any]):
+        prefix = options.get('prefix', '').strip('/')
+        start = f'{bucket}/{prefix}/' if prefix else f'{bucket}/'
+        entries = {}
+        with self.server.lock:
+            for key, metadata in self.server.object_metadata.items():
+                if not key.startswith(start):
+                    continue
+                name, _, nested = key[len(start):].partition('/')
+                entries[name] = {'name': name, 'id': None, 'metadata': None} if nested else dict(metadata, name=name)
+        offset, limit = options.get('offset', 0), options.get('limit', 100)
+        self._send_json(200, [entries[name] for name in sorted(entries)][offset:offset + limit])
+
+    # Responses
+
+    def _send_json(self, status: int, payload: Any, headers: Optional[Dict[str, str]] = None, head: bool = False):
+        data = b'' if payload is None else json.dumps(payload).encode('utf-8')
+        self._send_bytes(status, data, 'application/json', headers, head)
+
+    def _send_bytes(self, status: int, data: bytes, content_type: str,
+                    headers: Optional[Dict[str, str]] = None, head: bool = False):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if not head:
+            self.wfile.write(data)
+
+
+SupabaseStandinServer.handler_class = SupabaseRequestHandler
+
+
+def main():
+    server = SupabaseStandinServer(port=8788)
+    print("📡 Supabase stand-in server")
+    print("=" * 50)
+    print(f"URL: {server.url}")
+    print("Point SupabaseClient at this URL with any key; Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Supabase Table Statistics
+Row counts via HEAD requests, without transferring any rows
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from supabase_client import SupabaseClient
+
+COUNT_MODES = ('exact', 'planned', 'estimated')
+RECIPE_TABLES = ['recipes', 'ingredients', 'recipe_ingredients', 'preparation_steps']
+
+
+def parse_content_range(value: Optional[str]) -> Optional[int]:
+    """Total from a Content-Range header such as '0-24/3573' or '*/0'"""
+    if not value or '/' not in value:
+        return None
+    total = value.rsplit('/', 1)[1]
+    return int(total) if total.isdigit() else None
+
+
+class TableStats:
+    def __init__(self, client: SupabaseClient, max_workers: int = 4):
+        self.client = client
+        self.max_workers = max_workers
+
+    def count(self, table: str, filters: str = '', mode: str = 'exact') -> int:
+        """Row count without transferring any rows
+
+        'estimated' uses the exact count for small tables and the planner's
+        estimate above PostgREST's max-rows, which stays cheap on big tables.
+        """
+        status, total = self._head_count(table, filters, mode)
+        if status not in [200, 206]:
+            raise RuntimeError(f"Failed to count {table}: HTTP {status}")
+        if total is None:
+            raise RuntimeError(f"Failed to count {table}: no total in Content-Range")
+        return total
+
+    def table_counts(self, tables: Iterable[str] = RECIPE_TABLES, mode: str = 'exact') -> Dict[str, Dict[str, Any]]:
+        """Count several tables concurrently, keeping each table's HTTP status"""
+        tables = list(tables)
+
+        def count_one(table: str) -> Dict[str, Any]:
+            try:
+                status, total = self._head_count(table, '', mode)
+            except Exception as e:
+                return {'count': None, 'status': None, 'error': str(e)}
+            ok = status in [200, 206]
+            return {'count': total if ok else None, 'status': status, 'error': None if ok else f'HTTP {status}'}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return dict(zip(tables, executor.map(count_one, tables)))
+
+    def _head_count(self, table: str, filters: str, mode: str) -> Tuple[int, Optional[int]]:
+        if mode not in COUNT_MODES:
+            raise ValueError(f"mode must be one of {', '.join(COUNT_MODES)}")
+        path = f'/rest/v1/{table}?select=*'
+        if filters:
+            path += f'&{filters}'
+        response = self.client.head(path, headers={'Prefer': f'count={mode}'})
+        return response.status_code, parse_content_range(response.headers.get('Content-Range'))
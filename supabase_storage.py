@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Supabase Storage Bucket Helpers
+Paginated listing, ranged reads and bulk removal for the recipe-images bucket
+"""
+
+from typing import Any, Dict, Iterator, List, Optional
+
+from supabase_client import SupabaseClient
+
+DEFAULT_BUCKET = 'recipe-images'
+
+# Storage caps how many objects one multi-object DELETE may name
+REMOVE_BATCH_SIZE = 1000
+
+
+class StorageBucket:
+    def __init__(self, client: SupabaseClient, bucket: str = DEFAULT_BUCKET):
+        self.client = client
+        self.bucket = bucket
+
+    def list_objects(self, prefix: str = '', page_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Yield every object under prefix, following pages and sub-folders"""
+        folders = [prefix]
+        while folders:
+            folder = folders.pop()
+            offset = 0
+            while True:
+                response = self.client.post(
+                    f'/storage/v1/object/list/{self.bucket}',
+                    json={
+                        'prefix': folder,
+                        'limit': page_size,
+                        'offset': offset,
+                        'sortBy': {'column': 'name', 'order': 'asc'}
+                    }
+                )
+                if response.status_code != 200:
+                    raise RuntimeError(f"Failed to list {self.bucket}/{folder}: {response.status_code} - {response.text}")
+
+                entries = response.json()
+                for entry in entries:
+                    name = f"{folder.rstrip('/')}/{entry['name']}" if folder else entry['name']
+                    # Folders come back as placeholder rows without an id
+                    if entry.get('id') is None:
+                        folders.append(name)
+                        continue
+                    yield self._describe(name, entry)
+
+                if len(entries) < page_size:
+                    break
+                offset += page_size
+
+    def object_path(self, name: str) -> str:
+        return self.client.storage_object_path(self.bucket, name)
+
+    def public_url(self, name: str) -> str:
+        return self.client.public_object_url(self.bucket, name)
+
+    def read_range(self, name: str, range_header: str, max_bytes: int) -> Dict[str, Any]:
+        """Fetch a byte range of an object without ever reading more than max_bytes"""
+        response = self.client.get(self.object_path(name), headers={'Range': range_header}, stream=True)
+        try:
+            data = response.raw.read(max_bytes, decode_content=True) if response.status_code in [200, 206] else b''
+            return {
+                'status': response.status_code,
+                'data': data,
+                'total_size': self._total_size(response),
+                'content_type': response.headers.get('Content-Type', '').split(';')[0].strip()
+            }
+        finally:
+            response.close()
+
+    def remove_objects(self, names: List[str], batch_size: int = REMOVE_BATCH_SIZE) -> List[str]:
+        """Delete objects with the multi-object endpoint; returns the names actually removed"""
+        removed = []
+        for start in range(0, len(names), batch_size):
+            batch = names[start:start + batch_size]
+            response = self.client.delete(f'/storage/v1/object/{self.bucket}', json={'prefixes': batch})
+            if response.status_code != 200:
+                raise RuntimeError(f"Failed to remove objects from {self.bucket}: {response.status_code} - {response.text}")
+            removed.extend(entry['name'] for entry in response.json())
+        return removed
+
+    def _describe(self, name: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+        metadata = entry.get('metadata') or {}
+        return {
+            'name': name,
+            'size': metadata.get('size'),
+            'mimetype': metadata.get('mimetype'),
+            'etag': (metadata.get('eTag') or '').strip('"') or None,
+            'updated_at': entry.get('updated_at'),
+            'created_at': entry.get('created_at')
+        }
+
+    def _total_size(self, response) -> Optional[int]:
+        content_range = response.headers.get('Content-Range', '')
+        if '/' in content_range and not content_range.endswith('/*'):
+            return int(content_range.rsplit('/', 1)[1])
+        if response.status_code == 200 and response.headers.get('Content-Length'):
+            return int(response.headers['Content-Length'])
+        return None
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test HTTP Record/Replay
+Records a short session against the local Supabase stand-in, then replays it with the server gone
+"""
+
+import os
+import tempfile
+
+from http_recording import HttpRecorder, HttpReplayer, ReplayMiss, compare_recordings, load_recording
+from supabase_client import SupabaseClient
+from supabase_pagination import iter_rows
+from supabase_standin_server import SupabaseStandinServer
+from supabase_storage import StorageBucket
+
+IMAGE_DATA = bytes(range(256)) * 8
+
+
+def run_session(client: SupabaseClient):
+    """Paged reads, an insert, a binary upload and a ranged read"""
+    rows = list(iter_rows(client, 'recipes', 'id,name', page_size=2))
+    inserted = client.post('/rest/v1/ingredients', json={'name': 'Salt'}, headers={'Prefer': 'return=representation'})
+    bucket = StorageBucket(client)
+    uploaded = client.post(bucket.object_path('toast.png'), headers={'Content-Type': 'image/png'}, data=IMAGE_DATA)
+    head = bucket.read_range('toast.png', 'bytes=0-15', 16)
+    return [row['name'] for row in rows], inserted.json()[0]['name'], uploaded.status_code, head['data']
+
+
+def test_http_recording():
+    recipes = [{'id': f'recipe-{i}', 'name': f'Recipe {i}'} for i in range(5)]
+    server = SupabaseStandinServer(tables={'recipes': recipes}).start()
+    recording = os.path.join(tempfile.mkdtemp(), 'http_recording.jsonl')
+
+    try:
+        print("🧪 Recording a session...")
+        recorded = run_session(SupabaseClient(server.url, 'test-key', timeout=5, recorder=HttpRecorder(recording)))
+    finally:
+        server.stop()
+
+    entries = load_recording(recording)
+    # Three pages of recipes plus the empty page that ends the read, then three more requests
+    assert len(entries) == 7, f"expected 7 recorded requests, got {len(entries)}"
+    assert recorded == (['Recipe 0', 'Recipe 1', 'Recipe 2', 'Recipe 3', 'Recipe 4'], 'Salt', 200, IMAGE_DATA[:16])
+    print(f"✅ Recorded {len(entries)} requests")
+
+    print("🧪 Replaying without the server...")
+    replayer = HttpReplayer(recording)
+    client = SupabaseClient(server.url, 'test-key', timeout=5, replayer=replayer)
+    assert run_session(client) == recorded, "replayed responses differ from the recorded ones"
+    assert replayer.served == 7 and replayer.unused() == 0 and not replayer.misses
+    assert not replayer.changed_payloads
+
+    try:
+        client.get('/rest/v1/recipes?select=*')
+        assert False, "an unrecorded request was answered"
+    except ReplayMiss:
+        pass
+    assert compare_recordings(entries, entries) == []
+    print("✅ Replay served every request offline and flagged the unrecorded one")
+
+
+if __name__ == "__main__":
+    test_http_recording()
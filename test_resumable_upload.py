@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Test Resumable Upload
+Uploads a large recipe image to the local TUS stand-in with injected failures
+"""
+
+import os
+import tempfile
+
+from resumable_upload import ResumableImageUploader
+from supabase_client import SupabaseClient
+from tus_standin_server import TusStandinServer
+
+IMAGE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'recipe_images', 'quiche_with_peas_cheese.png')
+CHUNK_SIZE = 256 * 1024
+
+
+def test_resumable_upload():
+    server = TusStandinServer(interrupt_every=3).start()
+    state_file = os.path.join(tempfile.mkdtemp(), 'tus_uploads.json')
+    client = SupabaseClient(f"http://{server.server_address[0]}:{server.server_address[1]}", 'test-key', timeout=5)
+
+    with open(IMAGE_PATH, 'rb') as f:
+        image_data = f.read()
+
+    try:
+        print("🧪 Testing resumable upload...")
+
+        # First run: give up on the first dropped connection, like a killed script
+        first_run = ResumableImageUploader(client, chunk_size=CHUNK_SIZE, state_file=state_file, max_retries=0)
+        assert not first_run.upload_file(IMAGE_PATH, 'quiche_with_peas_cheese.png')
+        assert os.path.exists(state_file), "upload URL was not persisted"
+        sent_before_resume = server.bytes_received
+        assert 0 < sent_before_resume < len(image_data)
+        print(f"✅ Interrupted after {sent_before_resume} bytes, upload URL saved")
+
+        # Second run: resume from the acknowledged offset and ride out further drops
+        second_run = ResumableImageUploader(client, chunk_size=CHUNK_SIZE, state_file=state_file, max_retries=3)
+        assert second_run.upload_file(IMAGE_PATH, 'quiche_with_peas_cheese.png')
+
+        stored = server.objects['recipe-images/quiche_with_peas_cheese.png']
+        assert stored == image_data, "stored object does not match the source image"
+        assert len(server.uploads) == 1, "resume created a new upload instead of continuing"
+        assert first_run._load_state() == {}, "completed upload was not removed from the state file"
+        print(f"✅ Resumed and completed: {len(stored)} bytes, one upload session")
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    test_resumable_upload()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Local TUS Stand-in Server
+Minimal stand-in for the Supabase Storage resumable upload endpoint
+"""
+
+import base64
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict
+
+RESUMABLE_PATH = '/storage/v1/upload/resumable'
+
+
+class TusStandinServer(ThreadingHTTPServer):
+    """In-memory TUS 1.0.0 server
+
+    interrupt_every=N makes every Nth PATCH keep only half of its chunk and
+    drop the connection without answering, like a flaky mobile link.
+    """
+
+    daemon_threads = True
+    handler_class = None
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, interrupt_every: int = 0):
+        super().__init__((host, port), self.handler_class or TusRequestHandler)
+        self.interrupt_every = interrupt_every
+        self.uploads: Dict[str, Dict[str, Any]] = {}
+        self.objects: Dict[str, bytes] = {}
+        self.patch_count = 0
+        self.bytes_received = 0
+        self.lock = threading.Lock()
+
+    @property
+    def endpoint(self) -> str:
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}{RESUMABLE_PATH}'
+
+    def start(self) -> 'TusStandinServer':
+        """Serve on a background thread"""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class TusRequestHandler(BaseHTTPRequestHandler):
+    server: TusStandinServer
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        if self.path.rstrip('/') != RESUMABLE_PATH or not self._check_version():
+            return
+        length = int(self.headers.get('Upload-Length', '-1'))
+        if length < 0:
+            self._reply(400)
+            return
+
+        metadata = {}
+        for pair in self.headers.get('Upload-Metadata', '').split(','):
+            if ' ' in pair:
+                key, value = pair.split(' ', 1)
+                metadata[key] = base64.b64decode(value).decode('utf-8')
+
+        upload_id = uuid.uuid4().hex
+        with self.server.lock:
+            self.server.uploads[upload_id] = {'length': length, 'data': bytearray(), 'metadata': metadata}
+            if length == 0:
+                self._complete(upload_id)
+        self._reply(201, {'Location': f'{RESUMABLE_PATH}/{upload_id}'})
+
+    def do_HEAD(self):
+        upload = self._find_upload()
+        if upload is None:
+            return
+        self._reply(200, {
+            'Upload-Offset': str(len(upload['data'])),
+            'Upload-Length': str(upload['length']),
+            'Cache-Control': 'no-store'
+        })
+
+    def do_PATCH(self):
+        upload = self._find_upload()
+        if upload is None:
+            return
+        if self.headers.get('Content-Type') != 'application/offset+octet-stream':
+            self._reply(415)
+            return
+
+        offset = int(self.headers.get('Upload-Offset', '-1'))
+        body_length = int(self.headers.get('Content-Length', '0'))
+        if offset != len(upload['data']):
+            self.rfile.read(body_length)
+            self._reply(409)
+            return
+
+        with self.server.lock:
+            self.server.patch_count += 1
+            interrupt = self.server.interrupt_every and self.server.patch_count % self.server.interrupt_every == 0
+
+        if interrupt:
+            partial = self.rfile.read(body_length // 2)
+            with self.server.lock:
+                upload['data'].extend(partial)
+                self.server.bytes_received += len(partial)
+            self.close_connection = True
+            self.connection.shutdown(2)
+            return
+
+        chunk = self.rfile.read(body_length)
+        with self.server.lock:
+            upload['data'].extend(chunk[:upload['length'] - len(upload['data'])])
+            self.server.bytes_received += len(chunk)
+            if len(upload['data']) == upload['length']:
+                self._complete(self.path.rsplit('/', 1)[-1])
+        self._reply(204, {'Upload-Offset': str(len(upload['data']))})
+
+    def _complete(self, upload_id: str):
+        upload = self.server.uploads[upload_id]
+        key = f"{upload['metadata'].get('bucketName', '')}/{upload['metadata'].get('objectName', upload_id)}"
+        self.server.objects[key] = bytes(upload['data'])
+
+    def _find_upload(self):
+        if not self._check_version():
+            return None
+        upload = self.server.uploads.get(self.path.rsplit('/', 1)[-1])
+        if upload is None:
+            self._reply(404)
+        return upload
+
+    def _check_version(self) -> bool:
+        if self.headers.get('Tus-Resumable') != '1.0.0':
+            self._reply(412, {'Tus-Version': '1.0.0'})
+            return False
+        return True
+
+    def _reply(self, status: int, headers: Dict[str, str] = None):
+        self.send_response(status)
+        self.send_header('Tus-Resumable', '1.0.0')
+        self.send_header('Content-Length', '0')
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+
+
+def main():
+    server = TusStandinServer(port=8787)
+    print("📡 TUS stand-in server")
+    print("=" * 50)
+    print(f"Endpoint: {server.endpoint}")
+    print("Press Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,8 @@ Updates the image_url field in recipes after manual upload to Supabase storage
 
 import requests
 import json
-from datetime import datetime
+
+from image_manifest import ImageManifest
 
 class RecipeImageUpdater:
     def __init__(self, supabase_url: str, supabase_key: str):
@@ -27,8 +28,7 @@ class RecipeImageUpdater:
             
             # Update the recipe in the database
             update_data = {
-                'image_url': image_url,
-                'updated_at': datetime.now().isoformat()
+                'image_url': image_url
             }
             
             response = requests.patch(
@@ -51,30 +51,15 @@ class RecipeImageUpdater:
     
     def update_all_recipe_images(self):
         """Update all recipe image URLs"""
-        # Recipe name to filename mapping
-        recipe_images = {
-            "Quick Chickpea Stew": "quick_chickpea_stew.png",
-            "Grilled Chicken Salad": "grilled_chicken_salad.png",
-            "Toast with Savory Jam": "toast_with_savory_jam.png",
-            "Muesli Without Spikes": "musli_with_pumpkin_seeds.png",
-            "My OMELETTE": "omelette-with_feta.png",
-            "Happy Halloumi": "halloumi_with_spinach.png",
-            "Comforting Quiche": "quiche_with_peas_cheese.png",
-            "Californian Quesadilla": "californian_quesadilla.png",
-            "Egg Muffins": "muffin_with_mushrooms.png",
-            "Salmon Toast": "salmon_toast.png",
-            "Spinach & Sausage": "spinach_and_sausage.png",
-            "Avocado Toast with prosciutto": "avocado_toast_with_prosciutto.png"
-        }
-        
         print("🖼️  Updating Recipe Image URLs")
         print("=" * 50)
         
+        manifest = ImageManifest.load()
         successful = 0
         failed = 0
         
-        for recipe_name, filename in recipe_images.items():
-            if self.update_recipe_image_url(recipe_name, filename):
+        for entry in manifest.entries:
+            if self.update_recipe_image_url(entry['recipe_name'], entry['key']):
                 successful += 1
             else:
                 failed += 1
@@ -83,7 +68,7 @@ class RecipeImageUpdater:
         print("📊 Update Results:")
         print(f"✅ Successful: {successful}")
         print(f"❌ Failed: {failed}")
-        print(f"📈 Total: {len(recipe_images)}")
+        print(f"📈 Total: {len(manifest.entries)}")
         
         if successful > 0:
             print(f"\n🎉 Successfully updated {successful} recipe image URLs!")
@@ -6,7 +6,6 @@ Updates recipe names to match the image filenames
 
 import requests
 import json
-from datetime import datetime
 
 class RecipeNameUpdater:
     def __init__(self, supabase_url: str, supabase_key: str):
@@ -23,8 +22,7 @@ class RecipeNameUpdater:
         """Update a recipe name in the database"""
         try:
             update_data = {
-                'name': new_name,
-                'updated_at': datetime.now().isoformat()
+                'name': new_name
             }
             
             response = requests.patch(
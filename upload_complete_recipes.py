@@ -4,51 +4,29 @@ Upload Complete Recipes Script
 Uploads recipes with ingredients and instructions to Supabase
 """
 
-import requests
 import json
-from datetime import datetime
 from typing import List, Dict, Any
 
+from ingredient_canonicalizer import IngredientResolver
+from supabase_client import SupabaseClient
+from supabase_metrics import DEFAULT_METRICS_FILE
+
 class CompleteRecipeUploader:
     def __init__(self, supabase_url: str, supabase_key: str):
-        self.supabase_url = supabase_url.rstrip('/')
-        self.supabase_key = supabase_key
-        self.headers = {
-            'apikey': supabase_key,
-            'Authorization': f'Bearer {supabase_key}',
-            'Content-Type': 'application/json',
-            'Prefer': 'return=minimal'
-        }
+        self.client = SupabaseClient(supabase_url, supabase_key)
+        self.metrics = self.client.metrics
+        self.ingredients = IngredientResolver(self.client)
     
     def ensure_ingredient_exists(self, ingredient_name: str) -> str:
-        """Ensure ingredient exists, create if it doesn't"""
+        """Ensure ingredient exists, create if it doesn't
+
+        Spelling variants of an existing ingredient resolve to it instead of adding a row.
+        """
         try:
-            # Check if ingredient exists
-            response = requests.get(
-                f'{self.supabase_url}/rest/v1/ingredients?name=eq.{ingredient_name}',
-                headers=self.headers
-            )
-            
-            if response.status_code == 200 and response.json():
-                return response.json()[0]['id']
-            
-            # Create new ingredient if not found
-            ingredient_payload = {
-                'name': ingredient_name,
-                'created_at': datetime.now().isoformat()
-            }
-            
-            response = requests.post(
-                f'{self.supabase_url}/rest/v1/ingredients',
-                headers=self.headers,
-                json=ingredient_payload
-            )
-            
-            if response.status_code in [200, 201]:
-                return response.json()[0]['id']
-            else:
+            ingredient_id = self.ingredients.resolve(ingredient_name)
+            if not ingredient_id:
                 print(f"❌ Failed to create ingredient: {ingredient_name}")
-                return None
+            return ingredient_id
                 
         except Exception as e:
             print(f"❌ Error with ingredient {ingredient_name}: {str(e)}")
@@ -59,7 +37,8 @@ class CompleteRecipeUploader:
         for ingredient in ingredients:
             try:
                 # Ensure ingredient exists
-                ingredient_id = self.ensure_ingredient_exists(ingredient['name'])
+                with self.metrics.span('resolve_ingredients'):
+                    ingredient_id = self.ensure_ingredient_exists(ingredient['name'])
                 if not ingredient_id:
                     continue
                 
@@ -74,11 +53,11 @@ class CompleteRecipeUploader:
                     'show_in_list': ingredient.get('show_in_list', True)
                 }
                 
-                response = requests.post(
-                    f'{self.supabase_url}/rest/v1/recipe_ingredients',
-                    headers=self.headers,
-                    json=payload
-                )
+                with self.metrics.span('insert_links'):
+                    response = self.client.post(
+                        '/rest/v1/recipe_ingredients',
+                        json=payload
+                    )
                 
                 if response.status_code not in [200, 201]:
                     print(f"❌ Failed to link ingredient {ingredient['name']} to recipe")
@@ -96,11 +75,11 @@ class CompleteRecipeUploader:
                     'instruction': instruction
                 }
                 
-                response = requests.post(
-                    f'{self.supabase_url}/rest/v1/preparation_steps',
-                    headers=self.headers,
-                    json=payload
-                )
+                with self.metrics.span('insert_steps'):
+                    response = self.client.post(
+                        '/rest/v1/preparation_steps',
+                        json=payload
+                    )
                 
                 if response.status_code not in [200, 201]:
                     print(f"❌ Failed to upload instruction step {i}")
@@ -111,10 +90,9 @@ class CompleteRecipeUploader:
     def update_recipe_data(self, recipe_name: str, recipe_data: Dict[str, Any]):
         """Update recipe with new data and upload ingredients/instructions"""
         try:
-            # First, get the recipe ID from the database
-            response = requests.get(
-                f'{self.supabase_url}/rest/v1/recipes?name=eq.{recipe_name}',
-                headers=self.headers
+            # First, get the recipe ID from the database; tombstoned copies are not this recipe
+            response = self.client.get(
+                f'/rest/v1/recipes?name=eq.{recipe_name}&deleted_at=is.null'
             )
             
             if response.status_code != 200 or not response.json():
@@ -131,15 +109,14 @@ class CompleteRecipeUploader:
                 'protein': recipe_data['protein'],
                 'carbs': recipe_data['carbs'],
                 'fats': recipe_data['fat'],
-                'calories': recipe_data['calories'],
-                'updated_at': datetime.now().isoformat()
+                'calories': recipe_data['calories']
             }
             
-            update_response = requests.patch(
-                f'{self.supabase_url}/rest/v1/recipes?name=eq.{recipe_name}',
-                headers=self.headers,
-                json=update_payload
-            )
+            with self.metrics.span('update_recipe'):
+                update_response = self.client.patch(
+                    f'/rest/v1/recipes?id=eq.{recipe_id}',
+                    json=update_payload
+                )
             
             if update_response.status_code not in [200, 201, 204]:
                 print(f"❌ Failed to update recipe data for {recipe_name}")
@@ -632,6 +609,8 @@ def main():
     
     uploader = CompleteRecipeUploader(SUPABASE_URL, SUPABASE_KEY)
     uploader.upload_all_recipes(recipes_data)
+    uploader.metrics.print_summary()
+    uploader.metrics.export(DEFAULT_METRICS_FILE)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,9 +1,53 @@
 #!/usr/bin/env python3
-import requests
 import json
+import mimetypes
 import os
 from urllib.parse import urlparse
-import time
+
+import requests
+
+from image_manifest import ImageManifest
+from image_upload_pipeline import ImageUploadPipeline
+from supabase_client import SupabaseClient
+from supabase_metrics import DEFAULT_METRICS_FILE
+
+# Bytes held in memory per transfer while relaying a download into storage
+RELAY_CHUNK_SIZE = 64 * 1024
+
+class RelayBody:
+    """Request body that forwards a streamed download one chunk at a time
+
+    Defining __len__ lets requests send a Content-Length instead of chunked
+    encoding when the source reported one, so storage sees the real size; a
+    length of 0 makes requests fall back to chunked encoding. bytes_relayed
+    is what SupabaseClient records as the bytes sent.
+    """
+    
+    def __init__(self, response: requests.Response, chunk_size: int = RELAY_CHUNK_SIZE):
+        self.response = response
+        self.chunk_size = chunk_size
+        self.bytes_relayed = 0
+        
+        # A compressed transfer is decoded on the way through, so its length no longer applies
+        encoding = response.headers.get('Content-Encoding', 'identity').lower()
+        length = response.headers.get('Content-Length')
+        self.length = int(length) if length and encoding == 'identity' else None
+    
+    def __iter__(self):
+        for chunk in self.response.iter_content(chunk_size=self.chunk_size):
+            if chunk:
+                self.bytes_relayed += len(chunk)
+                yield chunk
+    
+    def __len__(self):
+        return self.length or 0
+    
+    def content_type(self, filename: str) -> str:
+        """Pass through the source content type, falling back to the file extension"""
+        content_type = self.response.headers.get('Content-Type', '').split(';')[0].strip()
+        if content_type.startswith('image/'):
+            return content_type
+        return mimetypes.guess_type(filename)[0] or 'image/png'
 
 class SupabaseImageUploader:
     def __init__(self, supabase_url: str, supabase_key: str):
@@ -13,33 +57,31 @@ class SupabaseImageUploader:
             'Authorization': f'Bearer {supabase_key}',
             'Content-Type': 'application/json'
         }
+        self.client = SupabaseClient(supabase_url, supabase_key)
     
     def upload_image_from_url(self, image_url: str, filename: str) -> bool:
-        """Upload an image from URL to Supabase storage"""
+        """Relay an image from URL into Supabase storage without buffering the whole file"""
         try:
-            # Download the image from the URL
-            print(f"📥 Downloading {filename} from {image_url}...")
-            response = requests.get(image_url, timeout=30)
-            response.raise_for_status()
-            
-            # Upload to Supabase storage
-            storage_url = f"{self.supabase_url}/storage/v1/object/recipe-images/{filename}"
-            
-            upload_headers = {
-                'Authorization': f'Bearer {self.supabase_key}',
-                'Content-Type': 'image/png'  # Assuming PNG format
-            }
-            
-            print(f"📤 Uploading {filename} to Supabase...")
-            upload_response = requests.post(
-                storage_url,
-                headers=upload_headers,
-                data=response.content,
-                timeout=30
-            )
+            # Open the download as a stream; bytes are pulled only as the upload consumes them
+            print(f"📥 Streaming {filename} from {image_url}...")
+            # Through the client so the download shows up in metrics and recordings
+            with self.client.get(image_url, stream=True) as response:
+                response.raise_for_status()
+                body = RelayBody(response)
+                
+                upload_headers = {
+                    'Content-Type': body.content_type(filename)
+                }
+                
+                print(f"📤 Relaying {filename} to Supabase...")
+                upload_response = self.client.post(
+                    self.client.storage_object_path('recipe-images', filename),
+                    headers=upload_headers,
+                    data=body
+                )
             
             if upload_response.status_code in [200, 201]:
-                print(f"✅ Successfully uploaded: {filename}")
+                print(f"✅ Successfully uploaded: {filename} ({body.bytes_relayed} bytes)")
                 return True
             else:
                 print(f"❌ Failed to upload {filename}: {upload_response.status_code} - {upload_response.text}")
@@ -49,17 +91,16 @@ class SupabaseImageUploader:
             print(f"❌ Error uploading {filename}: {str(e)}")
             return False
     
-    def upload_all_recipe_images(self, recipes_file: str = "recipes.json") -> dict:
+    def upload_all_recipe_images(self, recipes_file: str = "recipes.json", max_in_flight: int = 8) -> dict:
         """Upload all recipe images from the recipes.json file"""
         try:
             with open(recipes_file, 'r') as f:
                 recipes = json.load(f)
             
             print(f"📁 Loaded {len(recipes)} recipes from {recipes_file}")
-            print("🚀 Starting image uploads...")
             
-            successful = 0
-            failed = 0
+            manifest = ImageManifest.load()
+            jobs = []
             
             for recipe in recipes:
                 recipe_name = recipe['name']
@@ -74,22 +115,14 @@ class SupabaseImageUploader:
                 filename = os.path.basename(parsed_url.path)
                 
                 if not filename or '.' not in filename:
-                    # Create filename from recipe name
-                    filename = f"{recipe_name.lower().replace(' ', '_').replace('&', 'and')}.png"
+                    filename = manifest.key_for(recipe_name, recipe.get('id'))
                 
-                if self.upload_image_from_url(image_url, filename):
-                    successful += 1
-                else:
-                    failed += 1
-                
-                # Small delay to avoid overwhelming the server
-                time.sleep(1)
+                jobs.append((filename, image_url))
             
-            return {
-                'successful': successful,
-                'failed': failed,
-                'total': len(recipes)
-            }
+            pipeline = ImageUploadPipeline(max_in_flight=max_in_flight, metrics=self.client.metrics)
+            results = pipeline.run(jobs, lambda filename, image_url: self.upload_image_from_url(image_url, filename))
+            results['total'] = len(recipes)
+            return results
             
         except Exception as e:
             print(f"❌ Error processing recipes: {str(e)}")
@@ -113,6 +146,8 @@ def main():
     print(f"✅ Successful: {results['successful']}")
     print(f"❌ Failed: {results['failed']}")
     print(f"📈 Total: {results['total']}")
+    if results.get('elapsed'):
+        print(f"⏱️  Elapsed: {results['elapsed']:.1f}s")
     
     if results['successful'] > 0:
         print(f"\n🎉 Successfully uploaded {results['successful']} images!")
@@ -121,6 +156,9 @@ def main():
     if results['failed'] > 0:
         print(f"\n⚠️  {results['failed']} images failed to upload.")
         print("Check the error messages above for details.")
+    
+    uploader.client.metrics.print_summary()
+    uploader.client.metrics.export(DEFAULT_METRICS_FILE)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -4,18 +4,26 @@ Simple Image Upload Script for Supabase
 Uploads recipe images to Supabase storage
 """
 
-import requests
 import os
 from pathlib import Path
 
+from image_manifest import ImageManifest
+from image_upload_pipeline import ImageUploadPipeline
+from resumable_upload import DEFAULT_CHUNK_SIZE, ResumableImageUploader
+from supabase_client import SupabaseClient
+from supabase_metrics import DEFAULT_METRICS_FILE
+
 class SimpleImageUploader:
-    def __init__(self, supabase_url: str, supabase_key: str):
+    def __init__(self, supabase_url: str, supabase_key: str, resumable: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE):
         self.supabase_url = supabase_url.rstrip('/')
         self.supabase_key = supabase_key
         self.headers = {
             'Authorization': f'Bearer {supabase_key}',
             'Content-Type': 'application/octet-stream'
         }
+        self.client = SupabaseClient(supabase_url, supabase_key)
+        # Resumable (TUS) mode sends chunks and picks up where an interrupted run stopped
+        self.resumable_uploader = ResumableImageUploader(self.client, chunk_size=chunk_size) if resumable else None
     
     def upload_image(self, image_path: str, filename: str) -> bool:
         """Upload a single image to Supabase storage"""
@@ -24,19 +32,20 @@ class SimpleImageUploader:
                 print(f"❌ Image file not found: {image_path}")
                 return False
             
+            if self.resumable_uploader:
+                print(f"📤 Uploading {filename} (resumable)...")
+                return self.resumable_uploader.upload_file(image_path, filename)
+            
             # Read the image file
             with open(image_path, 'rb') as f:
                 image_data = f.read()
             
             # Upload to Supabase storage
-            storage_url = f"{self.supabase_url}/storage/v1/object/recipe-images/{filename}"
-            
             print(f"📤 Uploading {filename}...")
-            response = requests.post(
-                storage_url,
+            response = self.client.post(
+                self.client.storage_object_path('recipe-images', filename),
                 headers=self.headers,
-                data=image_data,
-                timeout=30
+                data=image_data
             )
             
             if response.status_code in [200, 201]:
@@ -50,42 +59,25 @@ class SimpleImageUploader:
             print(f"❌ Error uploading {filename}: {str(e)}")
             return False
     
-    def upload_all_images(self):
+    def upload_all_images(self, max_in_flight: int = 8):
         """Upload all recipe images"""
-        # Recipe name to filename mapping
-        recipe_images = {
-            "quick_chickpea_stew.png": "quick_chickpea_stew.png",
-            "grilled_chicken_salad.png": "grilled_chicken_salad.png",
-            "toast_with_savory_jam.png": "toast_with_savory_jam.png",
-            "musli_with_pumpkin_seeds.png": "musli_with_pumpkin_seeds.png",
-            "omelette-with_feta.png": "omelette-with_feta.png",
-            "halloumi_with_spinach.png": "halloumi_with_spinach.png",
-            "quiche_with_peas_cheese.png": "quiche_with_peas_cheese.png",
-            "californian_quesadilla.png": "californian_quesadilla.png",
-            "muffin_with_mushrooms.png": "muffin_with_mushrooms.png",
-            "salmon_toast.png": "salmon_toast.png",
-            "spinach_and_sausage.png": "spinach_and_sausage.png",
-            "avocado_toast_with_prosciutto.png": "avocado_toast_with_prosciutto.png"
-        }
+        image_keys = ImageManifest.load().keys()
         
         print("🖼️  Simple Image Uploader for Supabase")
         print("=" * 50)
         
-        successful = 0
-        failed = 0
+        jobs = [(filename, f"recipe_images/{filename}") for filename in image_keys]
         
-        for filename in recipe_images.keys():
-            image_path = f"recipe_images/{filename}"
-            if self.upload_image(image_path, filename):
-                successful += 1
-            else:
-                failed += 1
+        pipeline = ImageUploadPipeline(max_in_flight=max_in_flight, metrics=self.client.metrics)
+        results = pipeline.run(jobs, lambda filename, image_path: self.upload_image(image_path, filename))
+        successful = results['successful']
         
         print("\n" + "=" * 50)
         print("📊 Upload Results:")
         print(f"✅ Successful: {successful}")
-        print(f"❌ Failed: {failed}")
-        print(f"📈 Total: {len(recipe_images)}")
+        print(f"❌ Failed: {results['failed']}")
+        print(f"📈 Total: {len(image_keys)}")
+        print(f"⏱️  Elapsed: {results['elapsed']:.1f}s")
         
         if successful > 0:
             print(f"\n🎉 Successfully uploaded {successful} images!")
@@ -98,6 +90,8 @@ def main():
     
     uploader = SimpleImageUploader(SUPABASE_URL, SUPABASE_KEY)
     uploader.upload_all_images()
+    uploader.client.metrics.print_summary()
+    uploader.client.metrics.export(DEFAULT_METRICS_FILE)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
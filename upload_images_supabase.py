@@ -1,20 +1,27 @@
 #!/usr/bin/env python3
-import requests
 import json
 import os
 from PIL import Image, ImageDraw, ImageFont
 import io
-import time
 import base64
 
+from image_manifest import ImageManifest
+from image_upload_pipeline import ImageUploadPipeline
+from resumable_upload import DEFAULT_CHUNK_SIZE, ResumableImageUploader
+from supabase_client import SupabaseClient
+from supabase_metrics import DEFAULT_METRICS_FILE
+
 class SupabaseImageUploader:
-    def __init__(self, supabase_url: str, supabase_key: str):
+    def __init__(self, supabase_url: str, supabase_key: str, resumable: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE):
         self.supabase_url = supabase_url.rstrip('/')
         self.supabase_key = supabase_key
         self.headers = {
             'Authorization': f'Bearer {supabase_key}',
             'Content-Type': 'application/json'
         }
+        self.client = SupabaseClient(supabase_url, supabase_key)
+        # Resumable (TUS) mode sends chunks and picks up where an interrupted run stopped
+        self.resumable_uploader = ResumableImageUploader(self.client, chunk_size=chunk_size) if resumable else None
     
     def create_placeholder_image(self, recipe_name: str, filename: str) -> bytes:
         """Create a placeholder image for a recipe"""
@@ -94,11 +101,15 @@ class SupabaseImageUploader:
     def upload_image_to_supabase(self, image_data: bytes, filename: str) -> bool:
         """Upload image data to Supabase storage using the correct API"""
         try:
+            if self.resumable_uploader:
+                print(f"📤 Uploading {filename} to Supabase (resumable)...")
+                return self.resumable_uploader.upload_bytes(image_data, filename)
+            
             # Convert image to base64
             image_base64 = base64.b64encode(image_data).decode('utf-8')
             
             # Use the correct Supabase storage API endpoint
-            storage_url = f"{self.supabase_url}/storage/v1/object/recipe-images/{filename}"
+            storage_path = self.client.storage_object_path('recipe-images', filename)
             
             # Prepare the request payload
             payload = {
@@ -107,16 +118,14 @@ class SupabaseImageUploader:
             }
             
             upload_headers = {
-                'Authorization': f'Bearer {self.supabase_key}',
                 'Content-Type': 'application/json'
             }
             
             print(f"📤 Uploading {filename} to Supabase...")
-            upload_response = requests.post(
-                storage_url,
+            upload_response = self.client.post(
+                storage_path,
                 headers=upload_headers,
-                json=payload,
-                timeout=30
+                json=payload
             )
             
             if upload_response.status_code in [200, 201]:
@@ -130,7 +139,7 @@ class SupabaseImageUploader:
             print(f"❌ Error uploading {filename}: {str(e)}")
             return False
     
-    def upload_all_recipe_images(self, recipes_file: str = "recipes.json") -> dict:
+    def upload_all_recipe_images(self, recipes_file: str = "recipes.json", max_in_flight: int = 8) -> dict:
         """Create and upload placeholder images for all recipes"""
         try:
             with open(recipes_file, 'r') as f:
@@ -139,37 +148,26 @@ class SupabaseImageUploader:
             print(f"📁 Loaded {len(recipes)} recipes from {recipes_file}")
             print("🚀 Creating and uploading placeholder images...")
             
-            successful = 0
-            failed = 0
+            manifest = ImageManifest.load()
+            jobs = []
             
             for recipe in recipes:
                 recipe_name = recipe['name']
-                
-                # Create filename from recipe name
-                filename = f"{recipe_name.lower().replace(' ', '_').replace('&', 'and').replace('(', '').replace(')', '')}.png"
-                
-                # Create placeholder image
-                print(f"🎨 Creating placeholder for: {recipe_name}")
-                image_data = self.create_placeholder_image(recipe_name, filename)
-                
-                # Upload to Supabase
-                if self.upload_image_to_supabase(image_data, filename):
-                    successful += 1
-                else:
-                    failed += 1
-                
-                # Small delay to avoid overwhelming the server
-                time.sleep(1)
+                filename = manifest.key_for(recipe_name, recipe.get('id'))
+                jobs.append((filename, recipe_name))
             
-            return {
-                'successful': successful,
-                'failed': failed,
-                'total': len(recipes)
-            }
+            pipeline = ImageUploadPipeline(max_in_flight=max_in_flight, metrics=self.client.metrics)
+            return pipeline.run(jobs, self.create_and_upload_image)
             
         except Exception as e:
             print(f"❌ Error processing recipes: {str(e)}")
             return {'successful': 0, 'failed': 0, 'total': 0}
+    
+    def create_and_upload_image(self, filename: str, recipe_name: str) -> bool:
+        """Render the placeholder for one recipe and upload it"""
+        print(f"🎨 Creating placeholder for: {recipe_name}")
+        image_data = self.create_placeholder_image(recipe_name, filename)
+        return self.upload_image_to_supabase(image_data, filename)
 
 def main():
     # Supabase credentials
@@ -189,6 +187,8 @@ def main():
     print(f"✅ Successful: {results['successful']}")
     print(f"❌ Failed: {results['failed']}")
     print(f"📈 Total: {results['total']}")
+    if results.get('elapsed'):
+        print(f"⏱️  Elapsed: {results['elapsed']:.1f}s")
     
     if results['successful'] > 0:
         print(f"\n🎉 Successfully uploaded {results['successful']} placeholder images!")
@@ -198,6 +198,9 @@ def main():
     if results['failed'] > 0:
         print(f"\n⚠️  {results['failed']} images failed to upload.")
         print("Check the error messages above for details.")
+    
+    uploader.client.metrics.print_summary()
+    uploader.client.metrics.export(DEFAULT_METRICS_FILE)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file